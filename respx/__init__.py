@@ -1,6 +1,10 @@
 from .__version__ import __version__
+from .cassette import Cassette
+from .clock import VirtualClock
+from .faults import StreamFault
 from .handlers import ASGIHandler, WSGIHandler
 from .models import MockResponse, Route
+from .ratelimit import RateLimit
 from .router import MockRouter, Router
 from .utils import SetCookie
 
@@ -15,6 +19,10 @@ from .api import (  # isort:skip
     pop,
     route,
     add,
+    add_many,
+    bulk,
+    replay,
+    load_har,
     request,
     get,
     post,
@@ -30,11 +38,15 @@ __all__ = [
     "__version__",
     "MockResponse",
     "MockRouter",
+    "RateLimit",
     "ASGIHandler",
+    "Cassette",
     "WSGIHandler",
     "Router",
     "Route",
     "SetCookie",
+    "StreamFault",
+    "VirtualClock",
     "mock",
     "routes",
     "calls",
@@ -45,6 +57,10 @@ __all__ = [
     "pop",
     "route",
     "add",
+    "add_many",
+    "bulk",
+    "replay",
+    "load_har",
     "request",
     "get",
     "post",
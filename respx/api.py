@@ -1,5 +1,16 @@
-from typing import Any, Optional, Union, overload
-
+import os
+from typing import (
+    Any,
+    ContextManager,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+    overload,
+)
+
+from .cassette import Cassette
 from .models import CallList, Route
 from .patterns import Pattern
 from .router import MockRouter
@@ -56,6 +67,31 @@ def add(route: Route, *, name: Optional[str] = None) -> Route:
     return mock.add(route, name=name)
 
 
+def add_many(routes: Union[Iterable[Route], Mapping[str, Route]]) -> List[Route]:
+    global mock
+    return mock.add_many(routes)
+
+
+def bulk() -> ContextManager[None]:
+    global mock
+    return mock.bulk()
+
+
+def replay(
+    cassette: Union[Cassette, str, "os.PathLike[str]"],
+    *patterns: Pattern,
+    name: Optional[str] = None,
+    **lookups: Any,
+) -> Route:
+    global mock
+    return mock.replay(cassette, *patterns, name=name, **lookups)
+
+
+def load_har(path: Union[str, "os.PathLike[str]"]) -> List[Route]:
+    global mock
+    return mock.load_har(path)
+
+
 def request(
     method: str,
     url: Optional[URLPatternTypes] = None,
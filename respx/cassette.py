@@ -0,0 +1,213 @@
+import json
+import mmap
+import os
+from functools import cached_property
+from hashlib import blake2b
+from threading import Lock
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import httpx
+
+from .patterns import EMPTY_CONTEXT, LookupMatcher, Match, Pattern
+from .utils import RequestView
+
+# Cassette key of an interaction, i.e. request method, URL and content digest
+Key = Tuple[str, str, str]
+
+# Position of a recorded interaction, i.e. meta offset, meta size and body size
+Record = Tuple[int, int, int]
+
+
+def get_key(request: httpx.Request) -> Key:
+    digest = blake2b(request.read(), digest_size=16).hexdigest()
+    return request.method, str(request.url), digest
+
+
+class Cassette:
+    """
+    Append-only file of recorded interactions, each stored as a key line, followed by
+    the response status and headers as JSON, and the raw response content:
+
+        <method> <url> <digest> <meta size> <body size>\\n<meta><body>\\n
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        self.path = os.fspath(path)
+        self._lock = Lock()
+
+    def record(
+        self,
+        request: httpx.Request,
+        status_code: int,
+        headers: Sequence[Tuple[bytes, bytes]],
+        content: bytes,
+    ) -> None:
+        method, url, digest = get_key(request)
+        meta = json.dumps(
+            {
+                "status_code": status_code,
+                "headers": [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in headers
+                ],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        line = f"{method} {url} {digest} {len(meta)} {len(content)}\n"
+        record = b"".join((line.encode("utf-8"), meta, content, b"\n"))
+        with self._lock, open(self.path, "ab") as file:
+            file.write(record)
+
+    def load(self) -> Tuple[Optional[mmap.mmap], Dict[Key, List[Record]]]:
+        """
+        Memory-maps the cassette, and indexes its interactions by key, without
+        parsing any response.
+        """
+        index: Dict[Key, List[Record]] = {}
+        try:
+            with open(self.path, "rb") as file:
+                if not os.fstat(file.fileno()).st_size:
+                    return None, index
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None, index
+
+        size = len(buffer)
+        position = 0
+        while position < size:
+            end = buffer.find(b"\n", position)
+            if end < 0:
+                break  # Partially written interaction
+            line = buffer[position:end].decode("utf-8")
+            method, url, digest, meta_size, body_size = line.split(" ")
+            position = end + 1 + int(meta_size) + int(body_size) + 1
+            if position > size:
+                break  # Partially written interaction
+            record = (end + 1, int(meta_size), int(body_size))
+            index.setdefault((method, url, digest), []).append(record)
+
+        return buffer, index
+
+
+class RecordingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Byte stream of a pass-through response, recording the response to given cassette
+    once fully streamed.
+    """
+
+    def __init__(
+        self,
+        stream: Union[Iterable[bytes], AsyncIterable[bytes]],
+        cassette: Cassette,
+        request: httpx.Request,
+        status_code: int,
+        headers: Sequence[Tuple[bytes, bytes]],
+    ) -> None:
+        self.stream = stream
+        self.cassette = cassette
+        self.request = request
+        self.status_code = status_code
+        self.headers = headers
+
+    def _record(self, chunks: List[bytes]) -> None:
+        content = b"".join(chunks)
+        self.cassette.record(self.request, self.status_code, self.headers, content)
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = []
+        for chunk in cast(Iterable[bytes], self.stream):
+            chunks.append(chunk)
+            yield chunk
+        self._record(chunks)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks = []
+        async for chunk in cast(AsyncIterable[bytes], self.stream):
+            chunks.append(chunk)
+            yield chunk
+        self._record(chunks)
+
+    def close(self) -> None:
+        close = getattr(self.stream, "close", None)
+        if close is not None:
+            close()
+
+    async def aclose(self) -> None:
+        aclose = getattr(self.stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class Replay:
+    """
+    Callable side effect, replaying responses recorded to given cassette, looked up
+    by request method, URL and content digest, in recorded order.
+    """
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+        self._buffer, self._index = cassette.load()
+        self._replays: Dict[Key, int] = {}
+
+    def __call__(
+        self, request: httpx.Request, **kwargs: Any
+    ) -> Optional[httpx.Response]:
+        key = get_key(request)
+        records = self._index.get(key)
+        if not records:
+            return None
+
+        # Replay in recorded order, repeating the last recorded response
+        count = self._replays.get(key, 0)
+        self._replays[key] = count + 1
+        offset, meta_size, body_size = records[min(count, len(records) - 1)]
+
+        assert self._buffer is not None
+        meta = json.loads(self._buffer[offset : offset + meta_size])
+        offset += meta_size
+        return httpx.Response(
+            meta["status_code"],
+            headers=[tuple(header) for header in meta["headers"]],
+            stream=httpx.ByteStream(self._buffer[offset : offset + body_size]),
+        )
+
+
+class Recorded(Pattern):
+    """
+    Pattern matching requests recorded to the cassette of given replay, by request
+    method, URL and content.
+
+    Keyed by cassette path, i.e. never equal to a pattern of other kind, to not get
+    replaced by a route recording to the same cassette.
+    """
+
+    key = "recorded"
+    reads_content = True
+    value: Replay
+
+    @cached_property
+    def _hash(self) -> int:
+        return hash((self.__class__, self.lookup, self.value.cassette.path))
+
+    def parse(self, request: RequestView) -> Key:
+        return get_key(request.request)
+
+    def _eq(self, value: Key) -> Match:
+        return Match(value in self.value._index)
+
+    def _compile_eq(self) -> LookupMatcher:
+        index = self.value._index
+        return lambda value: EMPTY_CONTEXT if value in index else None
@@ -0,0 +1,68 @@
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Union, cast
+
+import httpx
+
+from .utils import WrappedStream
+
+
+class Clock:
+    """
+    Clock used by routers to time calls, and to sleep simulated latency and bandwidth.
+    """
+
+    def time(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    async def asleep(self, seconds: float) -> None:
+        import anyio  # Sleep within any async backend, i.e. asyncio or trio
+
+        await anyio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    Clock advancing its time when sleeping, without actually sleeping.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    async def asleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+class ThrottledStream(WrappedStream):
+    """
+    Byte stream sleeping before each chunk, for the time it takes to transfer it
+    with given bandwidth in bytes per second.
+    """
+
+    def __init__(
+        self,
+        stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream],
+        bandwidth: float,
+        clock: Clock,
+    ) -> None:
+        super().__init__(stream)
+        self.bandwidth = bandwidth
+        self.clock = clock
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in cast(Iterable[bytes], self.stream):
+            self.clock.sleep(len(chunk) / self.bandwidth)
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in cast(AsyncIterable[bytes], self.stream):
+            await self.clock.asleep(len(chunk) / self.bandwidth)
+            yield chunk
@@ -0,0 +1,110 @@
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+import httpx
+
+from .clock import Clock
+from .utils import WrappedStream
+
+
+class StreamFault(NamedTuple):
+    """
+    Fault to inject into mocked response streams, stalling between chunks, and/or
+    raising given error instead of any content beyond a number of bytes or chunks.
+    """
+
+    after_bytes: Optional[int] = None
+    after_chunks: Optional[int] = None
+    error: Type[httpx.TransportError] = httpx.ReadError
+    stall: float = 0.0
+
+
+class FaultyStream(WrappedStream):
+    """
+    Byte stream injecting given fault, when iterated, for the request it responds to.
+    """
+
+    def __init__(
+        self,
+        stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream],
+        fault: StreamFault,
+        clock: Clock,
+        request: httpx.Request,
+    ) -> None:
+        super().__init__(stream)
+        self.fault = fault
+        self.clock = clock
+        self.request = request
+
+    def _get_stall(self, count: int) -> float:
+        """
+        Returns the seconds to stall before given chunk, cut short by any read timeout.
+        """
+        if not count:
+            return 0.0
+        timeout = self.request.extensions.get("timeout", {}).get("read")
+        if timeout is not None and self.fault.stall > timeout:
+            return timeout
+        return self.fault.stall
+
+    def _check_stall(self, stall: float) -> None:
+        if stall < self.fault.stall:
+            raise httpx.ReadTimeout("Mocked stream stalled", request=self.request)
+
+    def _cut(self, chunk: bytes, position: int, count: int) -> Tuple[bytes, bool]:
+        """
+        Returns given chunk, cut at any fault position, and whether to fault after it.
+        """
+        fault = self.fault
+        if fault.after_chunks is not None and count >= fault.after_chunks:
+            return b"", True
+        if fault.after_bytes is not None and position + len(chunk) > fault.after_bytes:
+            return chunk[: fault.after_bytes - position], True
+        return chunk, False
+
+    def _error(self, position: int) -> httpx.TransportError:
+        return self.fault.error(
+            f"Mocked stream fault after {position} bytes", request=self.request
+        )
+
+    def __iter__(self) -> Iterator[bytes]:
+        position = 0
+        for count, chunk in enumerate(cast(Iterable[bytes], self.stream)):
+            stall = self._get_stall(count)
+            if stall:
+                self.clock.sleep(stall)
+                self._check_stall(stall)
+
+            chunk, faulted = self._cut(chunk, position, count)
+            if chunk:
+                position += len(chunk)
+                yield chunk
+            if faulted:
+                raise self._error(position)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        position = 0
+        count = 0
+        async for chunk in cast(AsyncIterable[bytes], self.stream):
+            stall = self._get_stall(count)
+            if stall:
+                await self.clock.asleep(stall)
+                self._check_stall(stall)
+
+            chunk, faulted = self._cut(chunk, position, count)
+            if chunk:
+                position += len(chunk)
+                yield chunk
+            if faulted:
+                raise self._error(position)
+            count += 1
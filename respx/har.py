@@ -0,0 +1,175 @@
+import base64
+import json
+import os
+import re
+from json.decoder import WHITESPACE  # type: ignore[attr-defined]
+from typing import IO, Any, Dict, Iterator, Optional, Union
+
+import httpx
+
+from .models import Route
+
+# Response headers describing the original encoding of HAR content, i.e. not replayed
+ENCODING_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# End of a JSON number or literal, which may otherwise be decoded truncated
+SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JSONReader:
+    """
+    Incremental reader of a JSON document, decoding one value at a time, to iterate
+    large objects and arrays without loading them whole.
+    """
+
+    def __init__(self, file: IO[str], chunk_size: int = 2**16) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _read(self) -> bool:
+        """
+        Reads more of the document, at least doubling any unread buffer,
+        and returns False when at end of file.
+        """
+        if self._eof:
+            return False
+        buffer = self._buffer[self._position :]
+        chunk = self.file.read(max(self.chunk_size, len(buffer)))
+        self._buffer = buffer + chunk
+        self._position = 0
+        self._eof = not chunk
+        return not self._eof
+
+    def peek(self) -> str:
+        """
+        Returns the next non-whitespace character, or an empty string at end of file.
+        """
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer) or not self._read():
+                return self._buffer[self._position : self._position + 1]
+
+    def _consume(self, char: str) -> bool:
+        if self.peek() != char:
+            return False
+        self._position += 1
+        return True
+
+    def _expect(self, char: str) -> None:
+        if not self._consume(char):
+            raise json.JSONDecodeError(
+                f"Expecting {char!r}", self._buffer, self._position
+            )
+
+    def decode(self) -> Any:
+        """
+        Decodes the next value.
+        """
+        if self.peek() not in '{["':
+            while not SCALAR_END.search(self._buffer, self._position) and self._read():
+                pass
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            self._position = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yields the keys of the next object, each value to be read before next key.
+        """
+        self._expect("{")
+        if self._consume("}"):
+            return
+        while True:
+            key = self.decode()
+            self._expect(":")
+            yield key
+            if self._consume("}"):
+                return
+            self._expect(",")
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Yields once for each item of the next array, each item to be read before next.
+        """
+        self._expect("[")
+        if self._consume("]"):
+            return
+        while True:
+            yield
+            if self._consume("]"):
+                return
+            self._expect(",")
+
+
+def iter_entries(path: Union[str, "os.PathLike[str]"]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the entries of given HAR file, one at a time.
+    """
+    with open(path, encoding="utf-8-sig") as file:
+        reader = JSONReader(file)
+        for key in reader.iter_object():
+            if key != "log":
+                reader.decode()
+                continue
+            for key in reader.iter_object():
+                if key != "entries":
+                    reader.decode()
+                    continue
+                for _ in reader.iter_array():
+                    yield reader.decode()
+
+
+def get_content(content: Dict[str, Any]) -> bytes:
+    text = content.get("text", "")
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+def get_route(entry: Dict[str, Any]) -> Optional[Route]:
+    """
+    Returns a route mocking the response of given HAR entry, matching the request
+    method, URL and any content, or None for an aborted request.
+    """
+    request, response = entry["request"], entry["response"]
+    if not response["status"]:
+        return None
+
+    lookups = {"method": request["method"], "url": request["url"]}
+    text = request.get("postData", {}).get("text")
+    if text:
+        lookups["content"] = text
+
+    headers = [
+        (header["name"], header["value"])
+        for header in response.get("headers", ())
+        if not header["name"].startswith(":")  # HTTP/2 pseudo headers
+        and header["name"].lower() not in ENCODING_HEADERS
+    ]
+    return Route(**lookups).mock(
+        return_value=httpx.Response(
+            response["status"],
+            headers=headers,
+            content=get_content(response.get("content", {})),
+        )
+    )
+
+
+def iter_routes(path: Union[str, "os.PathLike[str]"]) -> Iterator[Route]:
+    """
+    Yields routes mocking the responses of given HAR file, one entry at a time.
+    """
+    for entry in iter_entries(path):
+        route = get_route(entry)
+        if route is not None:
+            yield route
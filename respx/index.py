@@ -0,0 +1,390 @@
+import re
+from itertools import product
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern as RegexPattern,
+    Sequence,
+    Tuple,
+    Type,
+)
+from unittest.mock import ANY
+
+import httpx
+
+from .patterns import (
+    URL,
+    Host,
+    Lookup,
+    Method,
+    Params,
+    Path,
+    Pattern,
+    Port,
+    Scheme,
+    _And,
+    iter_operands,
+)
+from .utils import RequestView
+
+if TYPE_CHECKING:
+    from .models import Route  # pragma: nocover
+
+# Patterns, and their keys, that can be looked up by exact request values
+EXACT_PATTERNS: Tuple[Type[Pattern], ...] = (Method, Scheme, Host, Port, Path, Params)
+EXACT_KEYS: Tuple[str, ...] = tuple(P.key for P in EXACT_PATTERNS)
+
+# Patterns that can be combined into a single regex, when using the regex lookup
+REGEX_PATTERNS: Tuple[Type[Pattern], ...] = (Host, Path, URL)
+
+# Regex syntax that depends on group numbers or names, i.e. unsafe to combine
+UNSAFE_REGEX = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+NAMED_GROUP = re.compile(r"(?<!\\)\(\?P<\w+>")
+
+
+def iter_conjuncts(pattern: Pattern) -> Iterator[Pattern]:
+    """
+    Yields the patterns that all must match for given pattern to match.
+    """
+    return filter(None, iter_operands(pattern, _And))
+
+
+def get_base_paths(base: str, path: str) -> Tuple[str, ...]:
+    """
+    Returns the request paths, that given path is stripped to by given base path.
+
+    Mirrors `Path.strip_base`, which ensures a leading slash after stripping.
+    """
+    if path[1:].startswith("/"):
+        return (base + path,)
+    return (base + path, base + path[1:])
+
+
+def get_exact_values(pattern: Pattern) -> Dict[str, Tuple[Any, ...]]:
+    """
+    Returns the exact values, by pattern key, of which one is required by given
+    pattern to match.
+    """
+    values: Dict[str, Tuple[Any, ...]] = {}
+    for _pattern in iter_conjuncts(pattern):
+        if type(_pattern) not in EXACT_PATTERNS or _pattern.key in values:
+            continue
+
+        _values: Tuple[Any, ...]
+        if isinstance(_pattern, Params):
+            # Query params are looked up by their sorted multi items, unless ANY value
+            if _pattern.lookup is not Lookup.EQUAL or any(
+                value is ANY for values in _pattern._items.values() for value in values
+            ):
+                continue
+            _values = (get_params_items(_pattern.value),)
+        elif _pattern.lookup is Lookup.EQUAL:
+            _values = (_pattern.value,)
+        elif _pattern.lookup is Lookup.IN and isinstance(_pattern.value, (list, tuple)):
+            _values = tuple(_pattern.value)
+        else:
+            continue
+
+        base = _pattern.base
+        if base:
+            if not isinstance(base, Path) or base.lookup is not Lookup.STARTS_WITH:
+                continue  # pragma: nocover
+            _values = tuple(
+                path
+                for value in _values
+                for path in get_base_paths(str(base.value), value)
+            )
+
+        values[_pattern.key] = tuple(dict.fromkeys(_values))
+    return values
+
+
+def get_params_items(
+    params: httpx.QueryParams,
+) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    Returns given query params as multi items, sorted by key.
+    """
+    return tuple((key, tuple(params.get_list(key))) for key in sorted(params.keys()))
+
+
+# Parsers of the request values to look up exact patterns with, by pattern key
+EXACT_PARSERS: Dict[str, Callable[[RequestView], Any]] = {
+    Method.key: lambda request: request.method,
+    Scheme.key: lambda request: request.scheme,
+    Host.key: lambda request: request.host,
+    Port.key: lambda request: request.port,
+    Path.key: lambda request: request.path,
+    Params.key: lambda request: get_params_items(request.params),
+}
+
+
+def parse_exact_values(request: RequestView, keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Returns the request values to look up exact patterns with, by given pattern keys.
+    """
+    return {key: EXACT_PARSERS[key](request) for key in keys}
+
+
+def get_regex_source(regex: RegexPattern) -> Optional[str]:
+    """
+    Returns given regex source, stripped from named groups, if safe to combine.
+    """
+    source = regex.pattern
+    if not isinstance(source, str) or regex.flags != re.UNICODE:
+        return None
+    if UNSAFE_REGEX.search(source):
+        return None
+
+    # Named groups are not needed to find candidates, but must be unique when combined
+    source, count = NAMED_GROUP.subn("(?:", source)
+    if count != len(regex.groupindex) or re.compile(source).groupindex:
+        return None
+
+    return source
+
+
+def get_regex_pattern(pattern: Pattern) -> Optional[Tuple[Pattern, str]]:
+    """
+    Returns the first combinable regex pattern, and its source, required by given
+    pattern to match.
+    """
+    for _pattern in iter_conjuncts(pattern):
+        if (
+            type(_pattern) not in REGEX_PATTERNS
+            or _pattern.lookup is not Lookup.REGEX
+            or _pattern.base
+        ):
+            continue
+        source = get_regex_source(_pattern.value)
+        if source is not None:
+            return _pattern, source
+    return None
+
+
+def get_path_prefixes(pattern: Pattern) -> Tuple[str, ...]:
+    """
+    Returns the path prefixes, of which one is required by given pattern to match.
+    """
+    for _pattern in iter_conjuncts(pattern):
+        if type(_pattern) is not Path:
+            continue
+
+        base = _pattern.base
+        if base:
+            if not isinstance(base, Path) or base.lookup is not Lookup.STARTS_WITH:
+                continue  # pragma: nocover
+            if _pattern.lookup is not Lookup.STARTS_WITH:
+                return (str(base.value),)
+            prefixes = get_base_paths(str(base.value), str(_pattern.value))
+            # Skip prefixes already covered by a shorter prefix
+            return tuple(
+                prefix
+                for prefix in prefixes
+                if not any(
+                    prefix != _prefix and prefix.startswith(_prefix)
+                    for _prefix in prefixes
+                )
+            )
+
+        if _pattern.lookup is Lookup.STARTS_WITH:
+            return (str(_pattern.value),)
+
+    return ()
+
+
+class PrefixNode:
+    __slots__ = ("edges", "positions")
+
+    def __init__(self) -> None:
+        self.edges: Dict[str, Tuple[str, PrefixNode]] = {}
+        self.positions: List[int] = []
+
+
+class PrefixIndex:
+    """
+    Radix tree of path prefixes, with edges keyed by their first character,
+    to find all routes with a prefix of a request path in O(path length).
+    """
+
+    def __init__(self) -> None:
+        self._root = PrefixNode()
+
+    def __bool__(self) -> bool:
+        return bool(self._root.edges or self._root.positions)
+
+    def add(self, prefix: str, position: int) -> None:
+        node = self._root
+        while prefix:
+            edge = node.edges.get(prefix[0])
+            if edge is None:
+                child = PrefixNode()
+                node.edges[prefix[0]] = (prefix, child)
+                node = child
+                break
+
+            label, child = edge
+            size = len(label)
+            common = next(
+                (i for i in range(min(size, len(prefix))) if label[i] != prefix[i]),
+                min(size, len(prefix)),
+            )
+            if common < size:
+                # Split edge at common prefix
+                split = PrefixNode()
+                split.edges[label[common]] = (label[common:], child)
+                node.edges[prefix[0]] = (label[:common], split)
+                child = split
+
+            node = child
+            prefix = prefix[common:]
+
+        node.positions.append(position)
+
+    def search(self, path: str) -> Iterator[int]:
+        """
+        Yields positions of routes with a prefix of given path.
+        """
+        node = self._root
+        yield from node.positions
+        i = 0
+        while i < len(path):
+            edge = node.edges.get(path[i])
+            if edge is None:
+                return
+            label, node = edge
+            if not path.startswith(label, i):
+                return
+            i += len(label)
+            yield from node.positions
+
+
+class RegexIndex:
+    """
+    Regex patterns of the same key, combined into regexes of optional lookaheads,
+    tagged with named groups, to find all matching patterns in one scan per chunk.
+    """
+
+    chunk_size = 100
+
+    def __init__(self, parse: Callable[[RequestView], str]) -> None:
+        self.parse = parse
+        self._positions: Dict[str, List[int]] = {}
+        self._chunks: Optional[List[Tuple[RegexPattern, List[List[int]]]]] = None
+
+    def add(self, source: str, position: int) -> None:
+        self._positions.setdefault(source, []).append(position)
+
+    def compile(self) -> List[Tuple[RegexPattern, List[List[int]]]]:
+        sources = list(self._positions)
+        chunks = []
+        for i in range(0, len(sources), self.chunk_size):
+            chunk = sources[i : i + self.chunk_size]
+            regex = "".join(
+                f"(?:(?={self._lookahead(source)})(?P<_{n}>))?"
+                for n, source in enumerate(chunk)
+            )
+            positions = [self._positions[source] for source in chunk]
+            chunks.append((re.compile(regex), positions))
+        return chunks
+
+    def _lookahead(self, source: str) -> str:
+        if source.startswith("^") and "|" not in source:
+            # Anchored at start, no need to scan for a match
+            return source
+        return rf"[\s\S]*?(?:{source})"
+
+    def search(self, request: RequestView) -> Iterator[int]:
+        """
+        Yields positions of routes with a regex pattern matching given request.
+        """
+        if self._chunks is None:
+            self._chunks = self.compile()
+
+        value = self.parse(request)
+        for regex, positions in self._chunks:
+            match = regex.match(value)
+            assert match is not None
+            for tag, group in match.groupdict().items():
+                if group is not None:
+                    yield from positions[int(tag[1:])]
+
+
+class RouteIndex:
+    """
+    Index of routes, each indexed by its most selective pattern, in order of:
+
+    1. Exact values, including path, grouped by the pattern keys they are for
+    2. Combinable regex pattern, grouped by regex pattern key
+    3. Path prefixes, incl. base path, other than root
+    4. Exact values, e.g. method, host or query params
+
+    Remaining routes, e.g. with inverted or custom patterns, end up in the same,
+    ordered, fallback group of routes with no exact values.
+    """
+
+    def __init__(self, routes: Sequence["Route"]) -> None:
+        self._routes = tuple(routes)
+        self._groups: Dict[Tuple[str, ...], Dict[Tuple[Any, ...], List[int]]] = {}
+        self._regexes: Dict[str, RegexIndex] = {}
+        self._prefixes = PrefixIndex()
+
+        for position, route in enumerate(self._routes):
+            values = get_exact_values(route.pattern)
+            if Path.key not in values and (
+                self._add_regex(route.pattern, position)
+                or self._add_prefixes(route.pattern, position, bool(values))
+            ):
+                continue
+            keys = tuple(key for key in EXACT_KEYS if key in values)
+            group = self._groups.setdefault(keys, {})
+            for _values in product(*(values[key] for key in keys)):
+                group.setdefault(_values, []).append(position)
+
+        # Request values are only parsed for the pattern keys of any group
+        self._keys: Tuple[str, ...] = tuple(
+            key for key in EXACT_KEYS if any(key in keys for keys in self._groups)
+        )
+
+    def _add_regex(self, pattern: Pattern, position: int) -> bool:
+        regex_pattern = get_regex_pattern(pattern)
+        if regex_pattern is None:
+            return False
+        _pattern, source = regex_pattern
+        if _pattern.key not in self._regexes:
+            self._regexes[_pattern.key] = RegexIndex(_pattern.parse)
+        self._regexes[_pattern.key].add(source, position)
+        return True
+
+    def _add_prefixes(self, pattern: Pattern, position: int, exact: bool) -> bool:
+        prefixes = get_path_prefixes(pattern)
+        if not prefixes or (exact and all(len(prefix) <= 1 for prefix in prefixes)):
+            # Root path prefix is less selective than any exact value
+            return False
+        for prefix in prefixes:
+            self._prefixes.add(prefix, position)
+        return True
+
+    def candidates(self, request: RequestView) -> List["Route"]:
+        """
+        Returns routes that may match given request, in route order.
+        """
+        values = parse_exact_values(request, self._keys)
+        positions: List[int] = []
+        for keys, group in self._groups.items():
+            positions.extend(group.get(tuple(values[key] for key in keys), ()))
+        for regexes in self._regexes.values():
+            positions.extend(regexes.search(request))
+        if self._prefixes:
+            positions.extend(self._prefixes.search(request.path))
+
+        if len(self._groups) > 1 or self._regexes or self._prefixes:
+            positions.sort()
+
+        return [self._routes[position] for position in positions]
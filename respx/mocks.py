@@ -1,16 +1,32 @@
 import inspect
 from abc import ABC
+from functools import cached_property
 from types import MappingProxyType
-from typing import TYPE_CHECKING, ClassVar, Dict, List, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 from unittest import mock
+from urllib.parse import unquote
+from weakref import WeakKeyDictionary, WeakSet
 
 import httpcore
 import httpx
 
 from respx.patterns import parse_url
 
-from .models import AllMockedAssertionError, PassThrough
-from .transports import TryTransport
+from .models import ResolvedRoute
+from .transports import MockerTransport
+from .utils import RequestView, get_scheme_port
 
 if TYPE_CHECKING:
     from .router import Router  # pragma: nocover
@@ -18,6 +34,79 @@ if TYPE_CHECKING:
 __all__ = ["Mocker", "HTTPCoreMocker"]
 
 
+# Path segments removed, or resolved, by URL normalization
+DOT_SEGMENTS = frozenset((b".", b".."))
+
+
+class HTTPCoreRequestView(RequestView):
+    """
+    Request view over a raw `httpcore` request, parsing values to match on straight
+    from the raw request, and only creating the `HTTPX` request when needed.
+    """
+
+    def __init__(self, raw_request: httpcore.Request) -> None:
+        self.raw_request = raw_request
+
+    @cached_property
+    def request(self) -> httpx.Request:  # type: ignore[override]
+        raw_request = self.raw_request
+        request = httpx.Request(
+            self.method,
+            self.url,
+            headers=raw_request.headers,
+            stream=cast(httpx.SyncByteStream, raw_request.stream),
+            extensions=raw_request.extensions,
+        )
+        if isinstance(request.stream, httpx.ByteStream):
+            # Pre-read in-memory body, streamed bodies are read by routers when needed
+            request.read()
+        return request
+
+    @cached_property
+    def method(self) -> str:
+        method = self.raw_request.method
+        return method.decode("ascii") if isinstance(method, bytes) else method
+
+    @cached_property
+    def url(self) -> httpx.URL:
+        url = self.raw_request.url
+        return parse_url((url.scheme, url.host, url.port, url.target))
+
+    @cached_property
+    def headers(self) -> httpx.Headers:
+        return httpx.Headers(self.raw_request.headers)
+
+    @property
+    def extensions(self) -> MutableMapping[str, Any]:
+        return self.raw_request.extensions
+
+    @cached_property
+    def scheme(self) -> str:
+        return self.raw_request.url.scheme.decode("ascii").lower()
+
+    @cached_property
+    def host(self) -> str:
+        host = self.raw_request.url.host.decode("ascii").lower()
+        if host.startswith(("xn--", "[")):
+            return self.url.host  # Let HTTPX decode IDNA and IPv6 hosts
+        return host
+
+    @cached_property
+    def port(self) -> Optional[int]:
+        return self.raw_request.url.port or get_scheme_port(self.scheme)
+
+    @cached_property
+    def path(self) -> str:
+        path = self.raw_request.url.target.partition(b"?")[0]
+        if b"/." in path and DOT_SEGMENTS.intersection(path.split(b"/")):
+            return self.url.path  # Let HTTPX remove dot segments
+        return unquote(path.decode("ascii")) or "/"
+
+    @cached_property
+    def params(self) -> httpx.QueryParams:
+        return httpx.QueryParams(self.raw_request.url.target.partition(b"?")[2])
+
+
 class Mocker(ABC):
     _patches: ClassVar[List[mock._patch]]
     name: ClassVar[str]
@@ -105,36 +194,36 @@ class Mocker(ABC):
             cls.start()
 
     @classmethod
-    def handler(cls, httpx_request):
-        httpx_response = None
-        assertion_error = None
+    def _resolve(cls, request: Union[httpx.Request, RequestView]) -> ResolvedRoute:
+        # Share request view, and its parsed values, between routers
+        view = RequestView.of(request)
+        resolved = ResolvedRoute()
         for router in cls.routers:
-            try:
-                httpx_response = router.handler(httpx_request)
-            except AllMockedAssertionError as error:
-                assertion_error = error
-                continue
-            else:
+            resolved = router._resolve(view)
+            if resolved.is_mocked:
                 break
-        if assertion_error and not httpx_response:
-            raise assertion_error
-        return httpx_response
+        return resolved
 
     @classmethod
-    async def async_handler(cls, httpx_request):
-        httpx_response = None
-        assertion_error = None
+    async def _aresolve(
+        cls, request: Union[httpx.Request, RequestView]
+    ) -> ResolvedRoute:
+        view = RequestView.of(request)
+        resolved = ResolvedRoute()
         for router in cls.routers:
-            try:
-                httpx_response = await router.async_handler(httpx_request)
-            except AllMockedAssertionError as error:
-                assertion_error = error
-                continue
-            else:
+            resolved = await router._aresolve(view)
+            if resolved.is_mocked:
                 break
-        if assertion_error and not httpx_response:
-            raise assertion_error
-        return httpx_response
+        return resolved
+
+    @classmethod
+    def handler(cls, httpx_request):
+        return cls._resolve(httpx_request).unwrap(httpx_request)
+
+    @classmethod
+    async def async_handler(cls, httpx_request):
+        resolved = await cls._aresolve(httpx_request)
+        return resolved.unwrap(httpx_request)
 
     @classmethod
     def mock(cls, spec):
@@ -149,17 +238,38 @@ class HTTPXMocker(Mocker):
     ]
     target_methods = ["_transport_for_url"]
 
+    # Mocked transports, by client and url origin, reused until routers change
+    _transports: ClassVar[
+        "WeakKeyDictionary[Any, Dict[Tuple, MockerTransport]]"
+    ] = WeakKeyDictionary()
+
+    @classmethod
+    def register(cls, router: "Router") -> None:
+        super().register(router)
+        cls._transports.clear()
+
+    @classmethod
+    def unregister(cls, router: "Router") -> bool:
+        cls._transports.clear()
+        return super().unregister(router)
+
     @classmethod
     def mock(cls, spec):
-        def _transport_for_url(self, *args, **kwargs):
-            handler = (
-                cls.async_handler
-                if inspect.iscoroutinefunction(self.request)
-                else cls.handler
+        def _transport_for_url(self, url):
+            # Client mounts are matched by scheme, host and port only
+            key = (url.scheme, url.host, url.port)
+            transports = cls._transports.get(self)
+            if transports is None:
+                transports = cls._transports[self] = {}
+            elif key in transports:
+                return transports[key]
+
+            transport = MockerTransport(
+                resolve=cls._resolve,
+                aresolve=cls._aresolve,
+                pass_through=spec(self, url),
             )
-            mock_transport = httpx.MockTransport(handler)
-            pass_through_transport = spec(self, *args, **kwargs)
-            transport = TryTransport([mock_transport, pass_through_transport])
+            transports[key] = transport
             return transport
 
         return _transport_for_url
@@ -176,19 +286,17 @@ class AbstractRequestMocker(Mocker):
 
         def mock(self, *args, **kwargs):
             kwargs = cls._merge_args_and_kwargs(argspec, args, kwargs)
-            request = cls.to_httpx_request(**kwargs)
-            request, kwargs = cls.prepare_sync_request(request, **kwargs)
+            request_view = cls.to_request_view(**kwargs)
             response = cls._send_sync_request(
-                request, target_spec=spec, instance=self, **kwargs
+                request_view, target_spec=spec, instance=self, **kwargs
             )
             return response
 
         async def amock(self, *args, **kwargs):
             kwargs = cls._merge_args_and_kwargs(argspec, args, kwargs)
-            request = cls.to_httpx_request(**kwargs)
-            request, kwargs = await cls.prepare_async_request(request, **kwargs)
+            request_view = cls.to_request_view(**kwargs)
             response = await cls._send_async_request(
-                request, target_spec=spec, instance=self, **kwargs
+                request_view, target_spec=spec, instance=self, **kwargs
             )
             return response
 
@@ -207,44 +315,49 @@ class AbstractRequestMocker(Mocker):
         return new_kwargs
 
     @classmethod
-    def _send_sync_request(cls, httpx_request, *, target_spec, instance, **kwargs):
-        try:
-            httpx_response = cls.handler(httpx_request)
-        except PassThrough:
+    def _send_sync_request(cls, request_view, *, target_spec, instance, **kwargs):
+        resolved = cls._resolve(request_view)
+        if resolved.is_pass_through:
+            kwargs = cls.prepare_pass_through(request_view.request, **kwargs)
             response = target_spec(instance, **kwargs)
-        else:
-            response = cls.from_sync_httpx_response(httpx_response, instance, **kwargs)
-        return response
+            return cls.record_pass_through(resolved, request_view, response)
+
+        httpx_response = resolved.unwrap(request_view)
+        return cls.from_sync_httpx_response(httpx_response, instance, **kwargs)
 
     @classmethod
     async def _send_async_request(
-        cls, httpx_request, *, target_spec, instance, **kwargs
+        cls, request_view, *, target_spec, instance, **kwargs
     ):
-        try:
-            httpx_response = await cls.async_handler(httpx_request)
-        except PassThrough:
+        resolved = await cls._aresolve(request_view)
+        if resolved.is_pass_through:
+            kwargs = cls.prepare_pass_through(request_view.request, **kwargs)
             response = await target_spec(instance, **kwargs)
-        else:
-            response = await cls.from_async_httpx_response(
-                httpx_response, instance, **kwargs
-            )
-        return response
+            return cls.record_pass_through(resolved, request_view, response)
+
+        httpx_response = resolved.unwrap(request_view)
+        return await cls.from_async_httpx_response(httpx_response, instance, **kwargs)
 
     @classmethod
-    def prepare_sync_request(cls, httpx_request, **kwargs):
+    def to_request_view(cls, **kwargs):
         """
-        Sync pre-read request body
+        Create a request view, to route, from transport request args.
         """
-        httpx_request.read()
-        return httpx_request, kwargs
+        return RequestView(cls.to_httpx_request(**kwargs))  # pragma: nocover
 
     @classmethod
-    async def prepare_async_request(cls, httpx_request, **kwargs):
+    def prepare_pass_through(cls, httpx_request, **kwargs):
         """
-        Async pre-read request body
+        Prepare transport kwargs for a pass-through request.
         """
-        await httpx_request.aread()
-        return httpx_request, kwargs
+        return kwargs  # pragma: nocover
+
+    @classmethod
+    def record_pass_through(cls, resolved, request_view, response):
+        """
+        Record pass-through transport response, if resolved route records.
+        """
+        return response  # pragma: nocover
 
     @classmethod
     def to_httpx_request(cls, **kwargs):
@@ -271,50 +384,43 @@ class HTTPCoreMocker(AbstractRequestMocker):
     ]
     target_methods = ["handle_request", "handle_async_request"]
 
+    # Raw requests with recorded pass-through responses
+    _recorded: ClassVar["WeakSet[httpcore.Request]"] = WeakSet()
+
     @classmethod
-    def prepare_sync_request(cls, httpx_request, **kwargs):
+    def prepare_pass_through(cls, httpx_request, **kwargs):
         """
-        Sync pre-read request body, and update transport request arg.
+        Update transport request arg, with any stream read while routing.
         """
-        httpx_request, kwargs = super().prepare_sync_request(httpx_request, **kwargs)
         kwargs["request"].stream = httpx_request.stream
-        return httpx_request, kwargs
+        return kwargs
 
     @classmethod
-    async def prepare_async_request(cls, httpx_request, **kwargs):
+    def record_pass_through(cls, resolved, request_view, response):
         """
-        Async pre-read request body, and update transport request arg.
+        Record `httpcore` pass-through response, only once for nested transports.
         """
-        httpx_request, kwargs = await super().prepare_async_request(
-            httpx_request, **kwargs
-        )
-        kwargs["request"].stream = httpx_request.stream
-        return httpx_request, kwargs
+        raw_request = request_view.raw_request
+        if raw_request not in cls._recorded:
+            cls._recorded.add(raw_request)
+            response.stream = resolved.record(
+                request_view.request, response.status, response.headers, response.stream
+            )
+        return response
+
+    @classmethod
+    def to_request_view(cls, **kwargs):
+        """
+        Create a lazy request view from transport request arg.
+        """
+        return HTTPCoreRequestView(kwargs["request"])
 
     @classmethod
     def to_httpx_request(cls, **kwargs):
         """
         Create a `HTTPX` request from transport request arg.
         """
-        request = kwargs["request"]
-        method = (
-            request.method.decode("ascii")
-            if isinstance(request.method, bytes)
-            else request.method
-        )
-        raw_url = (
-            request.url.scheme,
-            request.url.host,
-            request.url.port,
-            request.url.target,
-        )
-        return httpx.Request(
-            method,
-            parse_url(raw_url),
-            headers=request.headers,
-            stream=request.stream,
-            extensions=request.extensions,
-        )
+        return HTTPCoreRequestView(kwargs["request"]).request
 
     @classmethod
     def from_sync_httpx_response(cls, httpx_response, target, **kwargs):
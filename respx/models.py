@@ -1,29 +1,44 @@
 import inspect
+import os
+from contextlib import contextmanager
+from copy import copy
+from itertools import tee
+from random import Random
 from typing import (
     Any,
     Dict,
     Iterator,
     List,
+    Mapping,
     NamedTuple,
     Optional,
     Sequence,
     Tuple,
     Type,
     Union,
+    cast,
 )
 from unittest import mock
 from warnings import warn
+from weakref import WeakSet
 
 import httpx
 
-from respx.utils import SetCookie
+from respx.utils import AliasTable, FileStream, RequestView, SetCookie, parse_range
 
-from .patterns import M, Pattern
+from .cassette import Cassette, RecordingStream
+from .faults import StreamFault
+from .index import RouteIndex
+from .patterns import M, Matcher, Pattern
+from .ratelimit import RateLimit
+from .stats import Stats
 from .types import (
     CallableSideEffect,
     Content,
     CookieTypes,
     HeaderTypes,
+    LatencyTypes,
+    OutcomeTypes,
     ResolvedResponseTypes,
     RouteResultTypes,
     SideEffectListTypes,
@@ -45,10 +60,251 @@ def clone_response(response: httpx.Response, request: httpx.Request) -> httpx.Re
     return response
 
 
-class Call(NamedTuple):
+def get_range_response(
+    response: httpx.Response, request: httpx.Request
+) -> httpx.Response:
+    """
+    Returns a partial response, of given bytes or file response, for a `GET` request
+    with a single byte `Range`, if the response accepts ranges and `If-Range` matches.
+    """
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or response.headers.get("Accept-Ranges") != "bytes"
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    if_range = request.headers.get("If-Range")
+    if if_range is not None:
+        validator = "ETag" if if_range.startswith('"') else "Last-Modified"
+        if if_range != response.headers.get(validator):
+            return response
+
+    source: Union[bytes, FileStream]
+    if isinstance(response.stream, FileStream):
+        source = response.stream
+        size = source.size
+    elif hasattr(response, "_content"):
+        source = response.content
+        size = len(source)
+    else:
+        return response  # Streamed
+
+    try:
+        byte_range = parse_range(request.headers["Range"], size)
+    except ValueError:
+        return httpx.Response(
+            416, headers={"Content-Range": f"bytes */{size}"}, request=request
+        )
+    if byte_range is None:
+        return response
+
+    start, stop = byte_range
+    headers = httpx.Headers(response.headers)
+    headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    headers["Content-Length"] = str(stop - start)
+    chunk = source[start:stop]
+    return httpx.Response(
+        206,
+        headers=headers,
+        stream=chunk if isinstance(chunk, FileStream) else httpx.ByteStream(chunk),
+        request=request,
+        extensions=response.extensions,
+    )
+
+
+class LazyRequestResponse(httpx.Response):
+    """
+    Mocked response bound to a request view, only creating the `HTTPX` request of
+    the view when the response request is first accessed.
+    """
+
+    def __init__(self, *args: Any, view: RequestView, **kwargs: Any) -> None:
+        self._view = view
+        self._bound_request: Optional[httpx.Request] = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def _request(self) -> Optional[httpx.Request]:
+        if self._bound_request is None:
+            self._bound_request = self._view.request
+        return self._bound_request
+
+    @_request.setter
+    def _request(self, request: Optional[httpx.Request]) -> None:
+        self._bound_request = request
+
+
+class ResponseTemplate:
+    """
+    Frozen, pre-read, response to cheaply create mocked responses from, without
+    re-encoding or re-reading its content for every request.
+    """
+
+    __slots__ = ("status_code", "headers", "stream", "content", "size", "extensions")
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.status_code = response.status_code
+        self.headers = httpx.Headers(response.headers)
+        self.stream = response.stream
+        self.extensions = dict(response.extensions)
+
+        # Read, and decode, content once
+        prototype = httpx.Response(
+            self.status_code, headers=self.headers, stream=self.stream
+        )
+        self.content = prototype.read()
+        self.size = prototype.num_bytes_downloaded
+
+    @classmethod
+    def of(cls, response: Optional[httpx.Response]) -> Optional["ResponseTemplate"]:
+        """
+        Returns a template of given response, unless streamed or bound to a request.
+        """
+        if (
+            response is None
+            or response._request
+            or not isinstance(response.stream, httpx.ByteStream)
+        ):
+            return None
+        return cls(response)
+
+    def is_current(self, response: httpx.Response) -> bool:
+        """
+        Returns True unless given, templated, response was changed since frozen.
+        """
+        return (
+            response.status_code == self.status_code
+            and response.stream is self.stream
+            and response.headers._list == self.headers._list
+            and response.extensions == self.extensions
+            and not response._request
+        )
+
+    def build(self, request: Union[httpx.Request, RequestView]) -> httpx.Response:
+        response = LazyRequestResponse(
+            self.status_code,
+            headers=self.headers,
+            stream=self.stream,
+            extensions=self.extensions,
+            view=RequestView.of(request),
+        )
+        # Mirror the state of a read, and closed, response
+        response._content = self.content
+        response._num_bytes_downloaded = self.size
+        response.is_stream_consumed = True
+        response.is_closed = True
+        return response
+
+
+def create_error(error: Type[Exception], request: httpx.Request) -> Exception:
+    """
+    Creates an exception of given type, bound to given request if a `HTTPX` error.
+    """
+    if issubclass(error, httpx.RequestError):
+        return error("Mock Error", request=request)
+    return error()
+
+
+class Mix:
+    """
+    Callable side effect, resolving one of given weighted outcomes per request,
+    drawn from a seeded random generator using a precomputed alias table.
+    """
+
+    reads_content = False
+
+    def __init__(
+        self,
+        outcomes: Union[Mapping[Any, float], Sequence[Tuple[OutcomeTypes, float]]],
+        *,
+        seed: Optional[int] = None,
+    ) -> None:
+        items = list(outcomes.items() if isinstance(outcomes, Mapping) else outcomes)
+        self.outcomes: List[
+            Union[ResponseTemplate, httpx.Response, Exception, Type[Exception]]
+        ] = []
+        for outcome, _ in items:
+            if isinstance(outcome, int):
+                outcome = httpx.Response(outcome)
+            if isinstance(outcome, httpx.Response):
+                # Prefer a frozen template, unless a streamed response
+                self.outcomes.append(ResponseTemplate.of(outcome) or outcome)
+            else:
+                self.outcomes.append(outcome)
+        self.table = AliasTable([weight for _, weight in items])
+        self.random = Random(seed)
+
+    def __call__(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        outcome = self.outcomes[self.table.sample(self.random)]
+        if isinstance(outcome, ResponseTemplate):
+            return outcome.build(request)
+        if isinstance(outcome, httpx.Response):
+            return outcome
+        if isinstance(outcome, Exception):
+            # Raise a copy, to not grow the traceback of the outcome on every draw
+            raise copy(outcome).with_traceback(None)
+        raise create_error(outcome, request)
+
+
+class _Call(NamedTuple):
     request: httpx.Request
     optional_response: Optional[httpx.Response]
 
+
+class Call(_Call):
+    """
+    Recorded request, and optional response, pair. The `HTTPX` request of a request
+    view is only created when first accessed, i.e. stored as is until then.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls,
+        request: Union[httpx.Request, RequestView],
+        optional_response: Optional[httpx.Response],
+    ) -> "Call":
+        if isinstance(request, RequestView) and "request" in vars(request):
+            request = request.request  # Already created
+        return super().__new__(cls, cast(httpx.Request, request), optional_response)
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return (
+            f"Call(request={self.request!r}, "
+            f"optional_response={self.optional_response!r})"
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        yield self.request
+        yield self.optional_response
+
+    def __getitem__(self, index: Any) -> Any:
+        return tuple(self)[index]
+
+    def __eq__(self, other: object) -> bool:
+        # Compare stored request views of calls, i.e. not creating their requests
+        if isinstance(other, Call) or not isinstance(other, tuple):
+            return tuple.__eq__(self, other)
+        return tuple(self) == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    @property
+    def request(self) -> httpx.Request:
+        request = cast(Union[httpx.Request, RequestView], tuple.__getitem__(self, 0))
+        if isinstance(request, RequestView):
+            return request.request
+        return request
+
+    @property
+    def optional_response(self) -> Optional[httpx.Response]:
+        return cast(Optional[httpx.Response], tuple.__getitem__(self, 1))
+
     @property
     def response(self) -> httpx.Response:
         if self.optional_response is None:
@@ -60,25 +316,96 @@ class Call(NamedTuple):
         return self.optional_response is not None
 
 
+class CallsSnapshot:
+    """
+    Snapshot state of a call list, only copying the snapshot calls when about to be
+    dropped from, or cleared, list, since calls are otherwise only appended.
+    """
+
+    __slots__ = ("length", "dropped", "last", "calls")
+
+    def __init__(self, length: int, dropped: int, last: Optional[Call]) -> None:
+        self.length = length
+        self.dropped = dropped
+        self.last = last
+        self.calls: Optional[Tuple[Call, ...]] = None
+
+
 class CallList(list, mock.NonCallableMock):
-    def __init__(self, *args: Sequence[Call], name: Any = "respx") -> None:
+    def __init__(
+        self,
+        *args: Sequence[Call],
+        name: Any = "respx",
+        maxlen: Optional[int] = None,
+    ) -> None:
         super().__init__(*args)
         mock.NonCallableMock.__init__(self, name=name)
+        self.maxlen = maxlen
+        self._dropped = 0
+        self._last: Optional[Call] = None
+        self._snapshots: List[CallsSnapshot] = []
 
     @property
     def called(self) -> bool:  # type: ignore[override]
-        return bool(self)
+        return self.call_count > 0
 
     @property
     def call_count(self) -> int:  # type: ignore[override]
-        return len(self)
+        return len(self) + self._dropped
 
     @property
     def last(self) -> Call:
+        if not self and self._last is not None:
+            return self._last
         return self[-1]
 
+    def append(self, call: Call) -> None:
+        super().append(call)
+        self._last = call
+        if self.maxlen is not None and len(self) > 2 * self.maxlen:
+            # Drop oldest calls in batches, i.e. not shifting the list on every call,
+            # but keep counting them
+            dropped = len(self) - self.maxlen
+            self._copy_snapshots()
+            del self[:dropped]
+            self._dropped += dropped
+
+    def clear(self) -> None:
+        self._copy_snapshots()
+        super().clear()
+        self._dropped = 0
+        self._last = None
+
+    def _snapshot(self) -> CallsSnapshot:
+        snapshot = CallsSnapshot(len(self), self._dropped, self._last)
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    def _copy_snapshots(self) -> None:
+        """
+        Copies the calls of snapshots not yet copied, before calls are removed.
+        """
+        for snapshot in self._snapshots:
+            snapshot.calls = tuple(self[: snapshot.length])
+        self._snapshots.clear()
+
+    def _restore(self, snapshot: CallsSnapshot) -> None:
+        # Forget given, and any later, snapshot not yet copied
+        while self._snapshots and self._snapshots.pop() is not snapshot:
+            pass
+
+        if snapshot.calls is None:
+            # Calls only appended since snapshot
+            del self[snapshot.length :]
+        else:
+            self[:] = snapshot.calls
+        self._dropped = snapshot.dropped
+        self._last = snapshot.last
+
     def record(
-        self, request: httpx.Request, response: Optional[httpx.Response]
+        self,
+        request: Union[httpx.Request, RequestView],
+        response: Optional[httpx.Response],
     ) -> Call:
         call = Call(request=request, optional_response=response)
         self.append(call)
@@ -94,6 +421,7 @@ class MockResponse(httpx.Response):
         content_type: Optional[str] = None,
         http_version: Optional[str] = None,
         cookies: Optional[Union[CookieTypes, Sequence[SetCookie]]] = None,
+        file: Optional[Union[str, "os.PathLike[str]"]] = None,
         **kwargs: Any,
     ) -> None:
         if not isinstance(content, (str, bytes)) and (
@@ -106,6 +434,8 @@ class MockResponse(httpx.Response):
 
         if content is not None:
             kwargs["content"] = content
+        if file is not None:
+            kwargs["stream"] = FileStream(file)
         if http_version:
             kwargs["extensions"] = kwargs.get("extensions", {})
             kwargs["extensions"]["http_version"] = http_version.encode("ascii")
@@ -114,6 +444,10 @@ class MockResponse(httpx.Response):
         if content_type:
             self.headers["Content-Type"] = content_type
 
+        if isinstance(self.stream, FileStream):
+            self.headers["Content-Length"] = str(self.stream.size)
+            self.headers["Accept-Ranges"] = "bytes"
+
         if cookies:
             if isinstance(cookies, dict):
                 cookies = tuple(cookies.items())
@@ -135,12 +469,22 @@ class Route:
         **lookups: Any,
     ) -> None:
         self._pattern = M(*patterns, **lookups)
+        self._matcher: Optional[Matcher] = None
         self._return_value: Optional[httpx.Response] = None
+        self._template: Optional[ResponseTemplate] = None
         self._side_effect: Optional[SideEffectTypes] = None
+        self._invoker: Optional[CallableSideEffect] = None
         self._pass_through: bool = False
+        self._latency: Optional[LatencyTypes] = None
+        self._bandwidth: Optional[float] = None
+        self._fault: Optional[StreamFault] = None
+        self._rate_limit: Optional[RateLimit] = None
+        self._cassette: Optional[Cassette] = None
         self._name: Optional[str] = None
         self._snapshots: List[Tuple] = []
+        self._route_lists: "WeakSet[RouteList]" = WeakSet()
         self.calls = CallList(name=self)
+        self.stats = Stats()
         self.snapshot()
 
     def __eq__(self, other: object) -> bool:
@@ -190,6 +534,25 @@ class Route:
     def pattern(self, pattern: Pattern) -> None:
         raise NotImplementedError("Can't change route pattern.")
 
+    def _journal(self) -> None:
+        # Let route lists snapshot this route's state before it's first changed
+        for routes in self._route_lists:
+            routes._journal(self)
+
+    def _set_pattern(self, pattern: Pattern) -> None:
+        if pattern is self._pattern:
+            # Same pattern may still have been merged with bases in place
+            self._matcher = None
+            for routes in self._route_lists:
+                routes._index = None
+            return
+        self._journal()
+        old_pattern, self._pattern = self._pattern, pattern
+        self._matcher = None
+        # Update route lists containing this route
+        for routes in self._route_lists:
+            routes._pattern_changed(self, old_pattern)
+
     @property
     def return_value(self) -> Optional[httpx.Response]:
         return self._return_value
@@ -200,6 +563,7 @@ class Route:
             raise TypeError(f"{return_value!r} is not an instance of httpx.Response")
         self.pass_through(False)
         self._return_value = return_value
+        self._template = ResponseTemplate.of(return_value)
 
     @property
     def side_effect(
@@ -213,29 +577,64 @@ class Route:
         side_effect: Optional[Union[SideEffectTypes, Sequence[SideEffectListTypes]]],
     ) -> None:
         self.pass_through(False)
+        self._invoker = None
         if not side_effect:
             self._side_effect = None
         elif isinstance(side_effect, (Iterator, Sequence)):
             self._side_effect = iter(side_effect)
         else:
             self._side_effect = side_effect
+            if callable(side_effect) and not isinstance(side_effect, type):
+                self._invoker = self._get_invoker(side_effect)
+
+    @property
+    def _reads_content(self) -> bool:
+        """
+        Returns whether matching, or resolving, this route may need the request content.
+        """
+        if any(pattern.reads_content for pattern in self._pattern):
+            return True
+        # Recorded interactions are keyed by request content
+        if self._cassette is not None:
+            return True
+        # Callable side effects may read the request, unless telling they don't,
+        # while exception side effects can't
+        side_effect = self._side_effect
+        return (
+            side_effect is not None
+            and not isinstance(side_effect, (Exception, type))
+            and getattr(side_effect, "reads_content", True)
+        )
+
+    def compile(self) -> Matcher:
+        """
+        Compiles, and caches, the route pattern matcher.
+        """
+        if self._matcher is None:
+            self._matcher = self._pattern.compile()
+        return self._matcher
 
     def snapshot(self) -> None:
-        # Clone iterator-type side effect to not get pre-exhausted when rolled back
+        # Tee iterator-type side effect to not get pre-exhausted when rolled back
         side_effect = self._side_effect
         if isinstance(side_effect, Iterator):
-            side_effects = tuple(side_effect)
-            self._side_effect = iter(side_effects)
-            side_effect = iter(side_effects)
+            self._side_effect, side_effect = tee(side_effect)
 
         self._snapshots.append(
             (
                 self._pattern,
                 self._name,
                 self._return_value,
+                self._template,
                 side_effect,
+                self._invoker,
                 self._pass_through,
-                CallList(self.calls, name=self),
+                self._latency,
+                self._bandwidth,
+                self._fault,
+                self._rate_limit,
+                self._cassette,
+                self.calls._snapshot(),
             ),
         )
 
@@ -244,17 +643,42 @@ class Route:
             return
 
         snapshot = self._snapshots.pop()
-        pattern, name, return_value, side_effect, pass_through, calls = snapshot
-
-        self._pattern = pattern
+        (
+            pattern,
+            name,
+            return_value,
+            template,
+            side_effect,
+            invoker,
+            pass_through,
+            latency,
+            bandwidth,
+            fault,
+            rate_limit,
+            cassette,
+            calls,
+        ) = snapshot
+
+        self._set_pattern(pattern)
         self._name = name
         self._return_value = return_value
+        self._template = template
         self._side_effect = side_effect
+        self._invoker = invoker
         self.pass_through(pass_through)
-        self.calls[:] = calls
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._fault = fault
+        self._rate_limit = rate_limit
+        self._cassette = cassette
+        self.calls._restore(calls)
 
     def reset(self) -> None:
+        self._journal()
         self.calls.clear()
+        self.stats.reset()
+        if self._rate_limit is not None:
+            self._rate_limit.reset()
 
     def mock(
         self,
@@ -281,8 +705,15 @@ class Route:
         stream: Optional[Union[httpx.SyncByteStream, httpx.AsyncByteStream]] = None,
         content_type: Optional[str] = None,
         http_version: Optional[str] = None,
+        file: Optional[Union[str, "os.PathLike[str]"]] = None,
+        latency: Optional[LatencyTypes] = None,
+        bandwidth: Optional[float] = None,
+        fault: Optional[StreamFault] = None,
         **kwargs: Any,
     ) -> "Route":
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError(f"Bandwidth must be positive, got {bandwidth!r}")
+
         response = MockResponse(
             status_code,
             headers=headers,
@@ -294,12 +725,40 @@ class Route:
             stream=stream,
             content_type=content_type,
             http_version=http_version,
+            file=file,
             **kwargs,
         )
-        return self.mock(return_value=response)
+        self.mock(return_value=response)
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._fault = fault
+        return self
+
+    def mix(
+        self,
+        outcomes: Union[Mapping[Any, float], Sequence[Tuple[OutcomeTypes, float]]],
+        *,
+        seed: Optional[int] = None,
+    ) -> "Route":
+        return self.mock(side_effect=Mix(outcomes, seed=seed))
+
+    def throttle(self, rate_limit: Optional[RateLimit]) -> "Route":
+        self._journal()
+        self._rate_limit = rate_limit
+        return self
 
     def pass_through(self, value: bool = True) -> "Route":
+        self._journal()
         self._pass_through = value
+        if not value:
+            self._cassette = None
+        return self
+
+    def record(self, cassette: Union[Cassette, str, "os.PathLike[str]"]) -> "Route":
+        if not isinstance(cassette, Cassette):
+            cassette = Cassette(cassette)
+        self.pass_through()
+        self._cassette = cassette
         return self
 
     @property
@@ -310,6 +769,27 @@ class Route:
     def called(self) -> bool:
         return self.calls.called
 
+    def _get_template(self) -> Optional[ResponseTemplate]:
+        """
+        Returns the template of the return value, frozen again if the return value
+        was changed since.
+        """
+        template = self._template
+        if template is not None and not template.is_current(
+            cast(httpx.Response, self._return_value)
+        ):
+            template = self._template = ResponseTemplate.of(self._return_value)
+        return template
+
+    def _get_latency(self) -> float:
+        """
+        Returns the simulated latency, in seconds, of a mocked response.
+        """
+        latency = self._latency
+        if latency is None:
+            return 0.0
+        return max(latency() if callable(latency) else latency, 0.0)
+
     @property
     def call_count(self) -> int:
         return self.calls.call_count
@@ -320,25 +800,40 @@ class Route:
         assert self._side_effect is not None
         effect: Union[CallableSideEffect, Exception, Type[Exception], httpx.Response]
         if isinstance(self._side_effect, Iterator):
+            self._journal()
             effect = next(self._side_effect)
         else:
             effect = self._side_effect
 
         return effect
 
+    def _get_invoker(self, effect: CallableSideEffect) -> CallableSideEffect:
+        """
+        Returns given side effect, or a wrapper adding the route kwarg if it wants it.
+        """
+        argspec = inspect.getfullargspec(effect)
+        if "route" not in argspec.args:
+            return effect
+
+        def invoker(request: httpx.Request, **kwargs: Any) -> RouteResultTypes:
+            return effect(request, **{**kwargs, "route": self})
+
+        return invoker
+
     def _call_side_effect(
         self, effect: CallableSideEffect, request: httpx.Request, **kwargs: Any
     ) -> RouteResultTypes:
-        # Add route kwarg if the side effect wants it
-        argspec = inspect.getfullargspec(effect)
         if "route" in kwargs:
             warn(f"Matched context contains reserved word `route`: {self.pattern!r}")
-        if "route" in argspec.args:
-            kwargs["route"] = self
+
+        # Reuse the invoker resolved when side effect was assigned, unless iterated
+        invoker = self._invoker
+        if invoker is None or effect is not self._side_effect:
+            invoker = self._get_invoker(effect)
 
         try:
             # Call side effect
-            result: RouteResultTypes = effect(request, **kwargs)
+            result: RouteResultTypes = invoker(request, **kwargs)
         except Exception as error:
             raise SideEffectError(self, origin=error) from error
 
@@ -368,14 +863,7 @@ class Route:
         # Handle Exception `type` side effect
         elif isinstance(effect, type):
             assert issubclass(effect, Exception)
-            raise SideEffectError(
-                self,
-                origin=(
-                    effect("Mock Error", request=request)
-                    if issubclass(effect, httpx.RequestError)
-                    else effect()
-                ),
-            )
+            raise SideEffectError(self, origin=create_error(effect, request))
 
         # Handle `Callable` side effect
         elif callable(effect):
@@ -385,60 +873,98 @@ class Route:
         # Resolved effect is a mocked response
         return effect
 
-    def resolve(self, request: httpx.Request, **kwargs: Any) -> RouteResultTypes:
+    def resolve(
+        self, request: Union[httpx.Request, RequestView], **kwargs: Any
+    ) -> RouteResultTypes:
+        view = RequestView.of(request)
         result: RouteResultTypes = None
 
+        if self._rate_limit is not None:
+            result = self._rate_limit.throttle(view.request)
+            if result is not None:
+                return result  # Rate limited
+
         if self._side_effect:
-            result = self._resolve_side_effect(request, **kwargs)
+            result = self._resolve_side_effect(view.request, **kwargs)
             if result is None:
                 return None  # Side effect resolved as a non-matching route
 
         elif self._return_value:
-            result = self._return_value
+            template = self._get_template()
+            if template is not None:
+                # Bound to request view, i.e. no request created unless accessed
+                result = template.build(view)
+            else:
+                result = self._return_value
 
         else:
             # Auto mock a new response
-            result = httpx.Response(200, request=request)
+            result = LazyRequestResponse(200, view=view)
 
-        if isinstance(result, httpx.Response) and not result._request:
-            # Clone reused Response for immutability
-            result = clone_response(result, request)
+        if isinstance(result, httpx.Response):
+            if not isinstance(result, LazyRequestResponse) and not result._request:
+                # Clone reused Response for immutability
+                result = clone_response(result, view.request)
+            if "Range" in view.headers:
+                result = get_range_response(result, view.request)
 
         return result
 
-    def match(self, request: httpx.Request) -> RouteResultTypes:
+    def match(
+        self,
+        request: Union[httpx.Request, RequestView],
+        *,
+        rate_limit: Optional[RateLimit] = None,
+    ) -> RouteResultTypes:
         """
         Matches and resolves request with given patterns and optional side effect.
 
         Returns None for a non-matching route, mocked response for a match,
-        or input request for pass-through.
+        or input request for pass-through. Any given, e.g. router, rate limit
+        is applied before resolving a match.
         """
-        context: Dict[str, Any] = {}
-
-        if self._pattern:
-            match = self._pattern.match(request)
-            if not match:
-                return None
-            context = match.context
+        view = RequestView.of(request)
+        context = (self._matcher or self.compile())(view)
+        if context is None:
+            return None
 
         if self._pass_through:
-            return request
+            return view.request
+
+        if rate_limit is not None:
+            throttled = rate_limit.throttle(view.request)
+            if throttled is not None:
+                return throttled
 
-        result = self.resolve(request, **context)
+        result = self.resolve(view, **context)
         return result
 
 
 class RouteList:
     _routes: List[Route]
     _names: Dict[str, Route]
+    _patterns: Optional[Dict[Pattern, Route]]
+    _index: Optional[RouteIndex]
+    _bulk: int
+    _shared: bool
+    _snapshots: List[Tuple["RouteList", Dict[int, Optional[Route]]]]
+    _restoring: bool
 
     def __init__(self, routes: Optional["RouteList"] = None) -> None:
         if routes is None:
             self._routes = []
             self._names = {}
+            self._shared = False
         else:
-            self._routes = list(routes._routes)
-            self._names = dict(routes._names)
+            # Share routes with given list, copied when either list is changed
+            self._routes = routes._routes
+            self._names = routes._names
+            self._shared = routes._shared = True
+        self._patterns = None
+        self._index = None
+        self._bulk = 0
+        self._snapshots = []
+        self._restoring = False
 
     def __repr__(self) -> str:
         return repr(self._routes)  # pragma: nocover
@@ -467,48 +993,176 @@ class RouteList:
         """
         if (i.start, i.stop, i.step) != (None, None, None):
             raise TypeError("Can't slice assign routes")
-        self._routes = list(routes._routes)
-        self._names = dict(routes._names)
+        self._routes = routes._routes
+        self._names = routes._names
+        self._shared = routes._shared = True
+        self._patterns = None
+        self._index = None
 
     def clear(self) -> None:
-        self._routes.clear()
-        self._names.clear()
+        self._routes = []
+        self._names = {}
+        self._shared = False
+        self._patterns = None
+        self._index = None
+
+    def _copy_on_write(self) -> None:
+        if self._shared:
+            self._routes = list(self._routes)
+            self._names = dict(self._names)
+            if self._patterns is not None:
+                self._patterns = dict(self._patterns)
+            self._shared = False
+
+    def _has_route(self, route: Route) -> bool:
+        patterns = self._patterns
+        if patterns is not None and len(patterns) == len(self._routes):
+            return patterns.get(route.pattern) is route
+        return any(_route is route for _route in self._routes)
+
+    def _get_patterns(self) -> Dict[Pattern, Route]:
+        """
+        Returns routes by pattern, first route wins for any duplicate pattern.
+        """
+        if self._patterns is None or len(self._patterns) != len(self._routes):
+            # Built lazily, and rebuilt for as long as there are duplicate patterns
+            self._patterns = {}
+            for route in self._routes:
+                self._patterns.setdefault(route.pattern, route)
+                route._route_lists.add(self)
+        return self._patterns
+
+    def _pattern_changed(self, route: Route, old_pattern: Pattern) -> None:
+        if self._patterns is not None and self._patterns.get(old_pattern) is route:
+            self._copy_on_write()
+            del self._patterns[old_pattern]
+            self._patterns.setdefault(route.pattern, route)
+        self._index = None
+
+    def snapshot(self) -> None:
+        """
+        Snapshots routes, and each route's state, lazily when first changed.
+        """
+        self._get_patterns()  # Registers routes, to journal their changes
+        routes = RouteList(self)
+        routes._patterns = self._patterns
+        routes._index = self._index
+        self._snapshots.append((routes, {}))
+
+    def rollback(self) -> None:
+        """
+        Rollbacks routes, and each changed route's state, to snapshot state.
+        """
+        if not self._snapshots:
+            return
+
+        routes, journal = self._snapshots.pop()
+        self._routes, self._names = routes._routes, routes._names
+        self._patterns, self._index = routes._patterns, routes._index
+        self._shared = True
+
+        self._restoring = True
+        try:
+            for route in journal.values():
+                if route is not None:
+                    route.rollback()
+        finally:
+            self._restoring = False
+
+    def _journal(self, route: Route) -> None:
+        """
+        Snapshots given route's state, when first changed since last snapshot.
+        """
+        if not self._snapshots or self._restoring:
+            return
+        routes, journal = self._snapshots[-1]
+        if id(route) in journal:
+            return
+        if routes._has_route(route):
+            route.snapshot()
+            journal[id(route)] = route
+        else:
+            journal[id(route)] = None  # Added since snapshot, nothing to roll back
+
+    def _get_index(self) -> RouteIndex:
+        if self._index is None:
+            self._index = RouteIndex(self._routes)
+            for route in self._routes:
+                route._route_lists.add(self)
+        return self._index
+
+    def candidates(self, request: RequestView) -> List[Route]:
+        """
+        Returns routes that may match given request, in route order.
+        """
+        return self._get_index().candidates(request)
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        Defers compiling added routes, and indexing all routes, until exit.
+        """
+        self._bulk += 1
+        try:
+            yield
+        finally:
+            self._bulk -= 1
+            if not self._bulk:
+                for route in self._routes:
+                    route.compile()
+                self._get_index()
 
     def add(self, route: Route, name: Optional[str] = None) -> Route:
+        self._copy_on_write()
+        self._index = None
+        patterns = self._get_patterns()
+
         # Find route with same name
         existing_route = self._names.pop(name or "", None)
 
-        if route in self._routes:
+        same_pattern_route = patterns.get(route.pattern)
+        if same_pattern_route is not None:
             if existing_route and existing_route != route:
                 # Re-use existing route with same name, and drop any with same pattern
-                index = self._routes.index(route)
-                same_pattern_route = self._routes.pop(index)
+                self._routes.remove(same_pattern_route)
+                del patterns[route.pattern]
                 if same_pattern_route.name:
+                    same_pattern_route._journal()
                     del self._names[same_pattern_route.name]
                     same_pattern_route._name = None
             elif not existing_route:
                 # Re-use existing route with same pattern
-                index = self._routes.index(route)
-                existing_route = self._routes[index]
+                existing_route = same_pattern_route
                 if existing_route.name:
+                    existing_route._journal()
                     del self._names[existing_route.name]
                     existing_route._name = None
 
         if existing_route:
             # Update existing route's pattern and mock
-            existing_route._pattern = route._pattern
+            existing_route._set_pattern(route._pattern)
             existing_route.return_value = route.return_value
             existing_route.side_effect = route.side_effect
             existing_route.pass_through(route.is_pass_through)
+            existing_route._latency = route._latency
+            existing_route._bandwidth = route._bandwidth
+            existing_route._fault = route._fault
+            existing_route._rate_limit = route._rate_limit
+            existing_route._cassette = route._cassette  # Cleared unless pass through
             route = existing_route
         else:
             # Add new route
             self._routes.append(route)
+            patterns[route.pattern] = route
+            route._route_lists.add(self)
 
         if name:
+            route._journal()
             route._name = name
             self._names[name] = route
 
+        if not self._bulk:
+            route.compile()
         return route
 
     def pop(self, name, default=...):
@@ -518,8 +1172,13 @@ class RouteList:
         Raises KeyError when `default` not provided and name is not found.
         """
         try:
-            route = self._names.pop(name)
+            route = self._names[name]
+            self._copy_on_write()
+            del self._names[name]
             self._routes.remove(route)
+            if self._patterns is not None:
+                self._patterns.pop(route.pattern, None)
+            self._index = None
             return route
         except KeyError as ex:
             if default is ...:
@@ -548,3 +1207,49 @@ class ResolvedRoute:
     def __init__(self):
         self.route: Optional[Route] = None
         self.response: Optional[ResolvedResponseTypes] = None
+
+    @property
+    def is_mocked(self) -> bool:
+        return self.route is not None or self.response is not None
+
+    @property
+    def is_pass_through(self) -> bool:
+        return isinstance(self.response, httpx.Request)
+
+    def unwrap(self, request: Union[httpx.Request, RequestView]) -> httpx.Response:
+        """
+        Returns the mocked response, or raises for a non-mocked or pass-through request.
+
+        Internally, resolved routes are passed as is, instead of raising and catching
+        exceptions, to tell mocked, non-mocked and pass-through requests apart.
+        """
+        if not self.is_mocked:
+            request = RequestView.of(request).request
+            raise AllMockedAssertionError(f"RESPX: {request!r} not mocked!")
+
+        if self.is_pass_through:
+            request = RequestView.of(request).request
+            raise PassThrough(
+                f"Request marked to pass through: {request!r}",
+                request=request,
+                origin=cast(Route, self.route),
+            )
+
+        assert isinstance(self.response, httpx.Response)
+        return self.response
+
+    def record(
+        self,
+        request: httpx.Request,
+        status_code: int,
+        headers: Sequence[Tuple[bytes, bytes]],
+        stream: Any,
+    ) -> Any:
+        """
+        Returns given pass-through response stream, recording the response to
+        the route cassette once streamed, if any.
+        """
+        cassette = self.route._cassette if self.route else None
+        if cassette is None:
+            return stream
+        return RecordingStream(stream, cassette, request, status_code, headers)
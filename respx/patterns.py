@@ -5,14 +5,14 @@ import pathlib
 import re
 from abc import ABC
 from enum import Enum
-from functools import reduce
-from http.cookies import SimpleCookie
+from functools import cached_property, reduce
 from types import MappingProxyType
 from typing import (
     Any,
     Callable,
     ClassVar,
     Dict,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -28,7 +28,7 @@ from urllib.parse import urljoin
 
 import httpx
 
-from respx.utils import MultiItems, decode_data
+from respx.utils import MultiItems, RequestView, ensure_path, get_scheme_port
 
 from .types import (
     URL as RawURL,
@@ -40,6 +40,13 @@ from .types import (
     URLPatternTypes,
 )
 
+Context = Mapping[str, Any]
+Matcher = Callable[[RequestView], Optional[Context]]
+LookupMatcher = Callable[[Any], Optional[Context]]
+
+# Shared and immutable context for compiled matches without any captured context
+EMPTY_CONTEXT: Context = MappingProxyType({})
+
 
 class Lookup(Enum):
     EQUAL = "eq"
@@ -69,6 +76,9 @@ class Pattern(ABC):
     key: ClassVar[str]
     lookups: ClassVar[Tuple[Lookup, ...]] = (Lookup.EQUAL,)
 
+    # Whether the request content needs to be read to match this pattern
+    reads_content: ClassVar[bool] = False
+
     lookup: Lookup
     base: Optional["Pattern"]
     value: Any
@@ -127,6 +137,10 @@ class Pattern(ABC):
         return f"<{self.__class__.__name__} {self.lookup.value} {repr(self.value)}>"
 
     def __hash__(self):
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
         return hash((self.__class__, self.lookup, self.value))
 
     def __eq__(self, other: object) -> bool:
@@ -136,9 +150,16 @@ class Pattern(ABC):
         """
         Clean and return pattern value.
         """
+        if (
+            self.lookup is Lookup.IN
+            and isinstance(value, Sequence)
+            and not isinstance(value, str)
+        ):
+            # Hashable, like the pattern itself
+            value = tuple(value)
         return value
 
-    def parse(self, request: httpx.Request) -> Any:  # pragma: nocover
+    def parse(self, request: RequestView) -> Any:  # pragma: nocover
         """
         Parse and return request value to match with pattern value.
         """
@@ -149,7 +170,7 @@ class Pattern(ABC):
 
     def match(self, request: httpx.Request) -> Match:
         try:
-            value = self.parse(request)
+            value = self.parse(RequestView.of(request))
         except Exception:
             return Match(False)
 
@@ -166,6 +187,64 @@ class Pattern(ABC):
         lookup_method = getattr(self, f"_{self.lookup.value}")
         return lookup_method(value)
 
+    def compile(self) -> Matcher:
+        """
+        Compile pattern into a matcher function.
+
+        The matcher returns the match context for a matching request, else None.
+        """
+        parse = self.parse
+        lookup = self._compile_lookup()
+
+        if not self.base:
+
+            def matcher(request: RequestView) -> Optional[Context]:
+                try:
+                    value = parse(request)
+                except Exception:
+                    return None
+                return lookup(value)
+
+            return matcher
+
+        base_lookup = self.base._compile_lookup()
+        strip_base = self.strip_base
+
+        def base_matcher(request: RequestView) -> Optional[Context]:
+            try:
+                value = parse(request)
+            except Exception:
+                return None
+            if base_lookup(value) is None:
+                return None
+            return lookup(strip_base(value))
+
+        return base_matcher
+
+    def _compile_lookup(self) -> LookupMatcher:
+        """
+        Compile lookup into a function, returning match context or None for value.
+
+        Uses the `_compile_<lookup>` method, defined by the same class as the
+        `_<lookup>` method, if any, or else falls back to wrap the lookup method.
+        """
+        name = f"_{self.lookup.value}"
+        compile_lookup = next(
+            vars(cls).get(f"_compile{name}")
+            for cls in type(self).__mro__
+            if name in vars(cls)
+        )
+        if compile_lookup:
+            return compile_lookup(self)
+
+        lookup_method = getattr(self, name)
+
+        def lookup(value: Any) -> Optional[Context]:
+            match = lookup_method(value)
+            return match.context if match else None
+
+        return lookup
+
     def _eq(self, value: Any) -> Match:
         return Match(value == self.value)
 
@@ -184,6 +263,27 @@ class Pattern(ABC):
     def _in(self, value: Any) -> Match:
         return Match(value in self.value)
 
+    def _compile_eq(self) -> LookupMatcher:
+        expected = self.value
+        return lambda value: EMPTY_CONTEXT if value == expected else None
+
+    def _compile_regex(self) -> LookupMatcher:
+        search = self.value.search
+
+        def lookup(value: str) -> Optional[Context]:
+            match = search(value)
+            return None if match is None else match.groupdict()
+
+        return lookup
+
+    def _compile_startswith(self) -> LookupMatcher:
+        prefix = self.value
+        return lambda value: EMPTY_CONTEXT if value.startswith(prefix) else None
+
+    def _compile_in(self) -> LookupMatcher:
+        expected = self.value
+        return lambda value: EMPTY_CONTEXT if value in expected else None
+
 
 class Noop(Pattern):
     def __init__(self) -> None:
@@ -200,6 +300,9 @@ class Noop(Pattern):
         # If this pattern is part of a combined pattern, always be truthy, i.e. noop
         return Match(True)
 
+    def compile(self) -> Matcher:
+        return lambda request: EMPTY_CONTEXT
+
 
 class PathPattern(Pattern):
     path: Optional[str]
@@ -233,6 +336,22 @@ class _And(Pattern):
             return b_match
         return Match(True, **{**a_match.context, **b_match.context})
 
+    def compile(self) -> Matcher:
+        # Flatten nested AND patterns into a single sequence of matchers
+        matchers = tuple(pattern.compile() for pattern in iter_operands(self, _And))
+
+        def matcher(request: RequestView) -> Optional[Context]:
+            context = EMPTY_CONTEXT
+            for _matcher in matchers:
+                _context = _matcher(request)
+                if _context is None:
+                    return None
+                if _context:
+                    context = {**context, **_context}
+            return context
+
+        return matcher
+
 
 class _Or(Pattern):
     value: Tuple[Pattern, Pattern]
@@ -253,6 +372,19 @@ class _Or(Pattern):
             match = b.match(request)
         return match
 
+    def compile(self) -> Matcher:
+        # Flatten nested OR patterns into a single sequence of matchers
+        matchers = tuple(pattern.compile() for pattern in iter_operands(self, _Or))
+
+        def matcher(request: RequestView) -> Optional[Context]:
+            for _matcher in matchers:
+                context = _matcher(request)
+                if context is not None:
+                    return context
+            return None
+
+        return matcher
+
 
 class _Invert(Pattern):
     value: Pattern
@@ -266,6 +398,14 @@ class _Invert(Pattern):
     def match(self, request: httpx.Request) -> Match:
         return ~self.value.match(request)
 
+    def compile(self) -> Matcher:
+        if isinstance(self.value, _Invert):
+            # Double negation, keeps any context of the inner pattern
+            return self.value.value.compile()
+
+        _matcher = self.value.compile()
+        return lambda request: EMPTY_CONTEXT if _matcher(request) is None else None
+
 
 class Method(Pattern):
     key = "method"
@@ -280,7 +420,7 @@ class Method(Pattern):
             value = tuple(v.upper() for v in value)
         return value
 
-    def parse(self, request: httpx.Request) -> str:
+    def parse(self, request: RequestView) -> str:
         return request.method
 
 
@@ -302,26 +442,38 @@ class MultiItemsMixin:
             for key in sorted(value.keys())
         )
 
-    def __hash__(self):
+    @cached_property
+    def _items(self) -> Dict[str, Tuple[Any, ...]]:
+        # Normalized pattern value, with ANY resolved, cleaned once when first used
+        return dict(self._multi_items(self.value, parse_any=True))
+
+    @cached_property
+    def _hash(self) -> int:
         return hash((self.__class__, self.lookup, self._multi_items(self.value)))
 
+    def _request_items(self, value: Any) -> Dict[str, Tuple[Any, ...]]:
+        return {key: tuple(value.get_list(key)) for key in value.keys()}
+
+    def _has_items(self, value: Any) -> bool:
+        for key, values in self._items.items():
+            if key not in value or tuple(value.get_list(key)) != values:
+                return False
+        return True
+
     def _eq(self, value: Any) -> Match:
-        value_items = self._multi_items(self.value, parse_any=True)
-        request_items = self._multi_items(value)
-        return Match(value_items == request_items)
+        return Match(self._items == self._request_items(value))
 
     def _contains(self, value: Any) -> Match:
-        if len(self.value.multi_items()) > len(value.multi_items()):
-            return Match(False)
-
-        value_items = self._multi_items(self.value, parse_any=True)
-        request_items = self._multi_items(value)
+        return Match(self._has_items(value))
 
-        for item in value_items:
-            if item not in request_items:
-                return Match(False)
+    def _compile_eq(self) -> LookupMatcher:
+        expected = self._items
+        request_items = self._request_items
+        return lambda value: EMPTY_CONTEXT if request_items(value) == expected else None
 
-        return Match(True)
+    def _compile_contains(self) -> LookupMatcher:
+        has_items = self._has_items
+        return lambda value: EMPTY_CONTEXT if has_items(value) else None
 
 
 class Headers(MultiItemsMixin, Pattern):
@@ -332,7 +484,7 @@ class Headers(MultiItemsMixin, Pattern):
     def clean(self, value: HeaderTypes) -> httpx.Headers:
         return httpx.Headers(value)
 
-    def parse(self, request: httpx.Request) -> httpx.Headers:
+    def parse(self, request: RequestView) -> httpx.Headers:
         return request.headers
 
 
@@ -341,7 +493,8 @@ class Cookies(Pattern):
     lookups = (Lookup.CONTAINS, Lookup.EQUAL)
     value: Set[Tuple[str, str]]
 
-    def __hash__(self):
+    @cached_property
+    def _hash(self) -> int:
         return hash((self.__class__, self.lookup, tuple(sorted(self.value))))
 
     def clean(self, value: CookieTypes) -> Set[Tuple[str, str]]:
@@ -350,21 +503,16 @@ class Cookies(Pattern):
 
         return set(value)
 
-    def parse(self, request: httpx.Request) -> Set[Tuple[str, str]]:
-        headers = request.headers
-
-        cookie_header = headers.get("cookie")
-        if not cookie_header:
-            return set()
-
-        cookies: SimpleCookie = SimpleCookie()
-        cookies.load(rawdata=cookie_header)
-
-        return {(cookie.key, cookie.value) for cookie in cookies.values()}
+    def parse(self, request: RequestView) -> Set[Tuple[str, str]]:
+        return request.cookies
 
     def _contains(self, value: Set[Tuple[str, str]]) -> Match:
         return Match(bool(self.value & value))
 
+    def _compile_contains(self) -> LookupMatcher:
+        expected = self.value
+        return lambda value: EMPTY_CONTEXT if expected & value else None
+
 
 class Scheme(Pattern):
     key = "scheme"
@@ -379,8 +527,8 @@ class Scheme(Pattern):
             value = tuple(v.lower() for v in value)
         return value
 
-    def parse(self, request: httpx.Request) -> str:
-        return request.url.scheme
+    def parse(self, request: RequestView) -> str:
+        return request.scheme
 
 
 class Host(Pattern):
@@ -393,10 +541,10 @@ class Host(Pattern):
     ) -> Union[str, RegexPattern[str]]:
         if self.lookup is Lookup.REGEX and isinstance(value, str):
             value = re.compile(value)
-        return value
+        return super().clean(value)
 
-    def parse(self, request: httpx.Request) -> str:
-        return request.url.host
+    def parse(self, request: RequestView) -> str:
+        return request.host
 
 
 class Port(Pattern):
@@ -404,11 +552,8 @@ class Port(Pattern):
     lookups = (Lookup.EQUAL, Lookup.IN)
     value: Optional[int]
 
-    def parse(self, request: httpx.Request) -> Optional[int]:
-        scheme = request.url.scheme
-        port = request.url.port
-        scheme_port = get_scheme_port(scheme)
-        return port or scheme_port
+    def parse(self, request: RequestView) -> Optional[int]:
+        return request.port
 
 
 class Path(Pattern):
@@ -433,10 +578,10 @@ class Path(Pattern):
             value = httpx.URL(path).path
         elif self.lookup is Lookup.REGEX and isinstance(value, str):
             value = re.compile(value)
-        return value
+        return super().clean(value)
 
-    def parse(self, request: httpx.Request) -> str:
-        return request.url.path
+    def parse(self, request: RequestView) -> str:
+        return request.path
 
     def strip_base(self, value: str) -> str:
         if self.base:
@@ -453,9 +598,8 @@ class Params(MultiItemsMixin, Pattern):
     def clean(self, value: QueryParamTypes) -> httpx.QueryParams:
         return httpx.QueryParams(value)
 
-    def parse(self, request: httpx.Request) -> httpx.QueryParams:
-        query = request.url.query
-        return httpx.QueryParams(query)
+    def parse(self, request: RequestView) -> httpx.QueryParams:
+        return request.params
 
 
 class URL(Pattern):
@@ -470,9 +614,7 @@ class URL(Pattern):
     def clean(self, value: URLPatternTypes) -> Union[str, RegexPattern[str]]:
         url: Union[str, RegexPattern[str]]
         if self.lookup is Lookup.EQUAL and isinstance(value, (str, tuple, httpx.URL)):
-            _url = parse_url(value)
-            _url = self._ensure_path(_url)
-            url = str(_url)
+            url = str(ensure_path(parse_url(value)))
         elif self.lookup is Lookup.REGEX and isinstance(value, str):
             url = re.compile(value)
         elif isinstance(value, (str, RegexPattern)):
@@ -481,21 +623,15 @@ class URL(Pattern):
             raise ValueError(f"Invalid url: {value!r}")
         return url
 
-    def parse(self, request: httpx.Request) -> str:
-        url = request.url
-        url = self._ensure_path(url)
-        return str(url)
-
-    def _ensure_path(self, url: httpx.URL) -> httpx.URL:
-        if not url._uri_reference.path:
-            url = url.copy_with(path="/")
-        return url
+    def parse(self, request: RequestView) -> str:
+        return request.url_string
 
 
 class ContentMixin:
-    def parse(self, request: httpx.Request) -> Any:
-        content = request.read()
-        return content
+    reads_content = True
+
+    def parse(self, request: RequestView) -> Any:
+        return request.content
 
 
 class Content(ContentMixin, Pattern):
@@ -511,6 +647,10 @@ class Content(ContentMixin, Pattern):
     def _contains(self, value: Union[bytes, str]) -> Match:
         return Match(self.value in value)
 
+    def _compile_contains(self) -> LookupMatcher:
+        expected = self.value
+        return lambda value: EMPTY_CONTEXT if expected in value else None
+
 
 class JSON(ContentMixin, PathPattern):
     lookups = (Lookup.EQUAL,)
@@ -520,9 +660,8 @@ class JSON(ContentMixin, PathPattern):
     def clean(self, value: Union[str, List, Dict]) -> str:
         return self.hash(value)
 
-    def parse(self, request: httpx.Request) -> str:
-        content = super().parse(request)
-        json = jsonlib.loads(content.decode("utf-8"))
+    def parse(self, request: RequestView) -> str:
+        json = request.json
 
         if self.path:
             value = json
@@ -547,6 +686,7 @@ class Data(MultiItemsMixin, Pattern):
     lookups = (Lookup.EQUAL, Lookup.CONTAINS)
     key = "data"
     value: MultiItems
+    reads_content = True
 
     def _normalize_value(self, value: Any) -> Union[str, List[str]]:
         if value is None:
@@ -561,15 +701,15 @@ class Data(MultiItemsMixin, Pattern):
             (key, self._normalize_value(value)) for key, value in value.items()
         )
 
-    def parse(self, request: httpx.Request) -> Any:
-        data, _ = decode_data(request)
-        return data
+    def parse(self, request: RequestView) -> Any:
+        return request.data
 
 
 class Files(MultiItemsMixin, Pattern):
     lookups = (Lookup.CONTAINS, Lookup.EQUAL)
     key = "files"
     value: MultiItems
+    reads_content = True
 
     def _normalize_file_value(self, value: FileTypes) -> Tuple[Tuple[Any, Any]]:
         # Mimic httpx `FileField` to normalize `files` kwarg to shortest tuple style
@@ -590,6 +730,15 @@ class Files(MultiItemsMixin, Pattern):
 
         return ((filename, fileobj),)
 
+    @cached_property
+    def _hash(self) -> int:
+        # Hash any ANY file field by its string, since mock.ANY is not hashable
+        items = tuple(
+            (key, tuple(tuple(str(v) if v is ANY else v for v in f) for f in values))
+            for key, values in self._multi_items(self.value)
+        )
+        return hash((self.__class__, self.lookup, items))
+
     def clean(self, value: RequestFiles) -> MultiItems:
         if isinstance(value, Mapping):
             value = list(value.items())
@@ -599,9 +748,19 @@ class Files(MultiItemsMixin, Pattern):
         )
         return files
 
-    def parse(self, request: httpx.Request) -> Any:
-        _, files = decode_data(request)
-        return files
+    def parse(self, request: RequestView) -> Any:
+        return request.files
+
+
+def iter_operands(pattern: Pattern, op: Type[Pattern]) -> Iterator[Pattern]:
+    """
+    Yields the operands of given, possibly nested, AND or OR pattern.
+    """
+    if isinstance(pattern, op):
+        for _pattern in pattern.value:
+            yield from iter_operands(_pattern, op)
+    else:
+        yield pattern
 
 
 def M(*patterns: Pattern, **lookups: Any) -> Pattern:
@@ -650,10 +809,6 @@ def M(*patterns: Pattern, **lookups: Any) -> Pattern:
     return combined_pattern
 
 
-def get_scheme_port(scheme: Optional[str]) -> Optional[int]:
-    return {"http": 80, "https": 443}.get(scheme or "")
-
-
 def combine(patterns: Sequence[Pattern], op: Callable = operator.and_) -> Pattern:
     patterns = tuple(filter(None, patterns))
     if not patterns:
@@ -10,7 +10,8 @@ from .router import MockRouter
 def pytest_configure(config):
     config.addinivalue_line(
         "markers",
-        "respx(assert_all_called=False, assert_all_mocked=False, base_url=...): "
+        "respx(assert_all_called=False, assert_all_mocked=False, base_url=..., "
+        "keep_calls=..., clock=..., rate_limit=...): "
         "configure the respx_mock fixture. "
         "See https://lundberg.github.io/respx/api.html#configuration",
     )
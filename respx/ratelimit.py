@@ -0,0 +1,76 @@
+from math import ceil
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional, Tuple, Union
+
+import httpx
+
+from .clock import Clock
+
+
+class RateLimit:
+    """
+    Token bucket rate limit, per given key of requests, answering `429 Too Many
+    Requests` with a `Retry-After` header when the bucket of a request is exhausted.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        burst: Optional[float] = None,
+        key: Optional[Union[str, Callable[[httpx.Request], Hashable]]] = None,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate!r}")
+        if key is not None and key != "host" and not callable(key):
+            raise ValueError(f"Key must be 'host' or a callable, got {key!r}")
+
+        self.rate = rate
+        self.burst = max(rate, 1.0) if burst is None else burst
+        self.key = key
+        self.clock = Clock() if clock is None else clock
+        self.throttled = 0
+
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._lock = Lock()
+
+    def _get_key(self, request: httpx.Request) -> Hashable:
+        if self.key is None:
+            return None
+        if self.key == "host":
+            return request.url.host
+        assert callable(self.key)
+        return self.key(request)
+
+    def _acquire(self, key: Hashable) -> float:
+        """
+        Takes a token from the bucket of given key, refilled since last taken,
+        and returns zero, or the seconds until a token is available.
+        """
+        with self._lock:
+            now = self.clock.time()
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self.throttled += 1
+                return (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+
+    def throttle(self, request: httpx.Request) -> Optional[httpx.Response]:
+        """
+        Returns a `429` response for given request, if rate limited, otherwise None.
+        """
+        retry_after = self._acquire(self._get_key(request))
+        if not retry_after:
+            return None
+        return httpx.Response(
+            429, headers={"Retry-After": str(ceil(retry_after))}, request=request
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self.throttled = 0
@@ -1,13 +1,17 @@
 import inspect
+import os
 from contextlib import contextmanager
 from functools import partial, update_wrapper, wraps
 from types import TracebackType
 from typing import (
     Any,
     Callable,
+    ContextManager,
     Dict,
     Generator,
+    Iterable,
     List,
+    Mapping,
     NewType,
     Optional,
     Tuple,
@@ -19,18 +23,24 @@ from typing import (
 
 import httpx
 
+from .cassette import Cassette, Recorded, Replay
+from .clock import Clock, ThrottledStream
+from .faults import FaultyStream
+from .har import iter_routes
 from .mocks import Mocker
 from .models import (
-    AllMockedAssertionError,
     CallList,
-    PassThrough,
+    CallsSnapshot,
     ResolvedRoute,
     Route,
     RouteList,
     SideEffectError,
 )
 from .patterns import Pattern, merge_patterns, parse_url_patterns
+from .ratelimit import RateLimit
+from .stats import Stats
 from .types import DefaultType, ResolvedResponseTypes, RouteResultTypes, URLPatternTypes
+from .utils import RequestView
 
 Default = NewType("Default", object)
 DEFAULT = Default(...)
@@ -43,15 +53,25 @@ class Router:
         assert_all_called: bool = True,
         assert_all_mocked: bool = True,
         base_url: Optional[str] = None,
+        keep_calls: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        rate_limit: Optional[RateLimit] = None,
     ) -> None:
+        if keep_calls is not None and keep_calls < 0:
+            raise ValueError(f"Keep calls must not be negative, got {keep_calls!r}")
+
         self._assert_all_called = assert_all_called
         self._assert_all_mocked = assert_all_mocked
         self._bases = parse_url_patterns(base_url, exact=False)
+        self._keep_calls = keep_calls
+        self.clock = Clock() if clock is None else clock
+        self.rate_limit = rate_limit
 
         self.routes = RouteList()
-        self.calls = CallList()
+        self.calls = CallList(maxlen=keep_calls)
+        self.stats = Stats()
 
-        self._snapshots: List[Tuple] = []
+        self._snapshots: List[CallsSnapshot] = []
         self.snapshot()
 
     def clear(self) -> None:
@@ -64,14 +84,9 @@ class Router:
         """
         Snapshots current routes and calls state.
         """
-        # Snapshot current routes and calls
-        routes = RouteList(self.routes)
-        calls = CallList(self.calls)
-        self._snapshots.append((routes, calls))
-
-        # Snapshot each route state
-        for route in routes:
-            route.snapshot()
+        # Snapshot current routes, and each route state lazily when first changed
+        self.routes.snapshot()
+        self._snapshots.append(self.calls._snapshot())
 
     def rollback(self) -> None:
         """
@@ -80,20 +95,18 @@ class Router:
         if not self._snapshots:
             return
 
-        # Revert added routes and calls to last snapshot
-        routes, calls = self._snapshots.pop()
-        self.routes[:] = routes
-        self.calls[:] = calls
-
-        # Revert each route state to last snapshot
-        for route in self.routes:
-            route.rollback()
+        # Revert added routes, changed route states, and calls to last snapshot
+        self.calls._restore(self._snapshots.pop())
+        self.routes.rollback()
 
     def reset(self) -> None:
         """
         Resets call stats.
         """
         self.calls.clear()
+        self.stats.reset()
+        if self.rate_limit is not None:
+            self.rate_limit.reset()
         for route in self.routes:
             route.reset()
 
@@ -131,20 +144,80 @@ class Router:
         route = Route(*patterns, **lookups)
         return self.add(route, name=name)
 
+    def replay(
+        self,
+        cassette: Union[Cassette, str, "os.PathLike[str]"],
+        *patterns: Pattern,
+        name: Optional[str] = None,
+        **lookups: Any,
+    ) -> Route:
+        """
+        Adds a route replaying responses recorded to given cassette, for matching
+        requests with a recorded method, URL and content.
+        """
+        if not isinstance(cassette, Cassette):
+            cassette = Cassette(cassette)
+        replay = Replay(cassette)
+        route = self.route(*patterns, Recorded(replay), name=name, **lookups)
+        return route.mock(side_effect=replay)
+
+    def load_har(self, path: Union[str, "os.PathLike[str]"]) -> List[Route]:
+        """
+        Adds routes mocking the responses of given HAR file, streamed one entry at a
+        time, by request method, URL and any content.
+
+        Repeated requests share the route of the first one, mocking the last response.
+        """
+        routes: Dict[int, Route] = {}
+        with self.bulk():
+            for route in iter_routes(path):
+                route = self.add(route)
+                routes.setdefault(id(route), route)
+        return list(routes.values())
+
     def add(self, route: Route, *, name: Optional[str] = None) -> Route:
         """
         Adds a route with optionally given name,
         replacing any existing route with same name or pattern.
         """
+        self._check_route(route)
+        route._set_pattern(merge_patterns(route.pattern, **self._bases))
+        route = self.routes.add(route, name=name)
+        route.calls.maxlen = self._keep_calls
+        return route
+
+    def add_many(
+        self, routes: Union[Iterable[Route], Mapping[str, Route]]
+    ) -> List[Route]:
+        """
+        Adds routes, optionally named by given mapping, in one go,
+        replacing any existing routes with same name or pattern.
+        """
+        items: List[Tuple[Optional[str], Route]]
+        if isinstance(routes, Mapping):
+            items = list(routes.items())
+        else:
+            items = [(None, route) for route in routes]
+
+        # Check all routes before adding any of them
+        for _, route in items:
+            self._check_route(route)
+
+        with self.bulk():
+            return [self.add(route, name=name) for name, route in items]
+
+    def bulk(self) -> ContextManager[None]:
+        """
+        Defers compiling added routes, and indexing all routes, until exit.
+        """
+        return self.routes.bulk()
+
+    def _check_route(self, route: Route) -> None:
         if not isinstance(route, Route):
             raise ValueError(
                 f"Invalid route {route!r}, please use respx.route(...).mock(...)"
             )
 
-        route._pattern = merge_patterns(route.pattern, **self._bases)
-        route = self.routes.add(route, name=name)
-        return route
-
     def request(
         self,
         method: str,
@@ -228,69 +301,167 @@ class Router:
 
     def record(
         self,
-        request: httpx.Request,
+        request: Union[httpx.Request, RequestView],
         *,
         response: Optional[httpx.Response] = None,
         route: Optional[Route] = None,
+        error: bool = False,
+        elapsed: Optional[float] = None,
     ) -> None:
         call = self.calls.record(request, response)
+        self.stats.record(
+            response, matched=route is not None, error=error, elapsed=elapsed
+        )
         if route:
+            route._journal()
             route.calls.append(call)
+            route.stats.record(response, error=error, elapsed=elapsed)
 
     @contextmanager
     def resolver(self, request: httpx.Request) -> Generator[ResolvedRoute, None, None]:
+        with self._resolver(request) as resolved:
+            yield resolved
+
+        resolved.unwrap(request)
+
+    @contextmanager
+    def _resolver(
+        self, request: Union[httpx.Request, RequestView]
+    ) -> Generator[ResolvedRoute, None, None]:
+        """
+        Records the resolved route, without raising for non-mocked or pass-through
+        requests, leaving that to the caller.
+        """
+        view = RequestView.of(request)
         resolved = ResolvedRoute()
+        clock = self.clock
+        started = clock.time()
 
         try:
             yield resolved
 
             if resolved.route is None:
-                # Assert we always get a route match, if check is enabled
                 if self._assert_all_mocked:
-                    raise AllMockedAssertionError(f"RESPX: {request!r} not mocked!")
+                    # Leave non-mocked request unresolved
+                    self.stats.record(
+                        None, matched=False, elapsed=clock.time() - started
+                    )
+                    return
 
                 # Auto mock a successful empty response
                 resolved.response = httpx.Response(200)
 
-            elif resolved.response == request:
+            elif resolved.is_pass_through:
                 # Pass-through request
-                raise PassThrough(
-                    f"Request marked to pass through: {request!r}",
-                    request=request,
-                    origin=resolved.route,
-                )
+                elapsed = clock.time() - started
+                self.record(view, route=resolved.route, elapsed=elapsed)
+                return
 
             else:
                 # Mocked response
                 assert isinstance(resolved.response, httpx.Response)
 
         except SideEffectError as error:
-            self.record(request, response=None, route=error.route)
+            elapsed = clock.time() - started
+            self.record(view, route=error.route, error=True, elapsed=elapsed)
             raise error.origin from error
-        except PassThrough:
-            self.record(request, response=None, route=resolved.route)
-            raise
         else:
-            self.record(request, response=resolved.response, route=resolved.route)
+            self.record(
+                view,
+                response=resolved.response,
+                route=resolved.route,
+                elapsed=clock.time() - started,
+            )
+
+    def _simulate(
+        self, resolved: ResolvedRoute, view: RequestView
+    ) -> Tuple[float, Optional[SideEffectError]]:
+        """
+        Wraps the mocked response stream with any route fault and bandwidth, and returns
+        the route latency to sleep, cut short by any read timeout error to raise.
+        """
+        route = resolved.route
+        response = resolved.response
+        if route is None or not isinstance(response, httpx.Response):
+            return 0.0, None
+
+        stream = response.stream
+        if route._fault:
+            stream = FaultyStream(stream, route._fault, self.clock, view.request)
+        if route._bandwidth:
+            stream = ThrottledStream(stream, route._bandwidth, self.clock)
+        if stream is not response.stream:
+            resolved.response = httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                stream=stream,
+                request=view.request,
+                extensions=response.extensions,
+            )
+
+        latency = route._get_latency()
+        if not latency:
+            return 0.0, None
+
+        timeout = view.extensions.get("timeout", {}).get("read")
+        if timeout is not None and latency > timeout:
+            error = httpx.ReadTimeout(
+                "Mocked latency exceeded timeout", request=view.request
+            )
+            return timeout, SideEffectError(route, origin=error)
+
+        return latency, None
 
     def resolve(self, request: httpx.Request) -> ResolvedRoute:
-        with self.resolver(request) as resolved:
-            for route in self.routes:
-                prospect = route.match(request)
+        resolved = self._resolve(request)
+        resolved.unwrap(request)
+        return resolved
+
+    def _resolve(self, request: Union[httpx.Request, RequestView]) -> ResolvedRoute:
+        view = RequestView.of(request)
+        with self._resolver(view) as resolved:
+            candidates = self.routes.candidates(view)
+            if any(route._reads_content for route in candidates):
+                view.request.read()
+
+            for route in candidates:
+                prospect = route.match(view, rate_limit=self.rate_limit)
                 if prospect is not None:
                     resolved.route = route
                     resolved.response = cast(ResolvedResponseTypes, prospect)
                     break
 
-        if resolved.response and isinstance(resolved.response.stream, httpx.ByteStream):
+            latency, timeout = self._simulate(resolved, view)
+            if latency:
+                self.clock.sleep(latency)
+            if timeout:
+                raise timeout
+
+        if isinstance(resolved.response, httpx.Response) and isinstance(
+            resolved.response.stream, httpx.ByteStream
+        ):
             resolved.response.read()  # Pre-read stream
 
         return resolved
 
     async def aresolve(self, request: httpx.Request) -> ResolvedRoute:
-        with self.resolver(request) as resolved:
-            for route in self.routes:
-                prospect: RouteResultTypes = route.match(request)
+        resolved = await self._aresolve(request)
+        resolved.unwrap(request)
+        return resolved
+
+    async def _aresolve(
+        self, request: Union[httpx.Request, RequestView]
+    ) -> ResolvedRoute:
+        view = RequestView.of(request)
+        with self._resolver(view) as resolved:
+            candidates = self.routes.candidates(view)
+            if any(route._reads_content for route in candidates):
+                await view.request.aread()
+
+            for route in candidates:
+                prospect: RouteResultTypes = route.match(
+                    view, rate_limit=self.rate_limit
+                )
 
                 # Await async side effect and wrap any exception
                 if inspect.isawaitable(prospect):
@@ -304,20 +475,25 @@ class Router:
                     resolved.response = cast(ResolvedResponseTypes, prospect)
                     break
 
-        if resolved.response and isinstance(resolved.response.stream, httpx.ByteStream):
+            latency, timeout = self._simulate(resolved, view)
+            if latency:
+                await self.clock.asleep(latency)
+            if timeout:
+                raise timeout
+
+        if isinstance(resolved.response, httpx.Response) and isinstance(
+            resolved.response.stream, httpx.ByteStream
+        ):
             await resolved.response.aread()  # Pre-read stream
 
         return resolved
 
     def handler(self, request: httpx.Request) -> httpx.Response:
-        resolved = self.resolve(request)
-        assert isinstance(resolved.response, httpx.Response)
-        return resolved.response
+        return self._resolve(request).unwrap(request)
 
     async def async_handler(self, request: httpx.Request) -> httpx.Response:
-        resolved = await self.aresolve(request)
-        assert isinstance(resolved.response, httpx.Response)
-        return resolved.response
+        resolved = await self._aresolve(request)
+        return resolved.unwrap(request)
 
 
 class MockRouter(Router):
@@ -327,12 +503,18 @@ class MockRouter(Router):
         assert_all_called: bool = True,
         assert_all_mocked: bool = True,
         base_url: Optional[str] = None,
+        keep_calls: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        rate_limit: Optional[RateLimit] = None,
         using: Optional[Union[str, Default]] = DEFAULT,
     ) -> None:
         super().__init__(
             assert_all_called=assert_all_called,
             assert_all_mocked=assert_all_mocked,
             base_url=base_url,
+            keep_calls=keep_calls,
+            clock=clock,
+            rate_limit=rate_limit,
         )
         self.Mocker: Optional[Type[Mocker]] = None
         self._using = using
@@ -345,6 +527,9 @@ class MockRouter(Router):
         assert_all_called: Optional[bool] = None,
         assert_all_mocked: Optional[bool] = None,
         base_url: Optional[str] = None,
+        keep_calls: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        rate_limit: Optional[RateLimit] = None,
         using: Optional[Union[str, Default]] = DEFAULT,
     ) -> "MockRouter":
         ...  # pragma: nocover
@@ -357,6 +542,9 @@ class MockRouter(Router):
         assert_all_called: Optional[bool] = None,
         assert_all_mocked: Optional[bool] = None,
         base_url: Optional[str] = None,
+        keep_calls: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        rate_limit: Optional[RateLimit] = None,
         using: Optional[Union[str, Default]] = DEFAULT,
     ) -> Callable:
         ...  # pragma: nocover
@@ -368,6 +556,9 @@ class MockRouter(Router):
         assert_all_called: Optional[bool] = None,
         assert_all_mocked: Optional[bool] = None,
         base_url: Optional[str] = None,
+        keep_calls: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        rate_limit: Optional[RateLimit] = None,
         using: Optional[Union[str, Default]] = DEFAULT,
     ) -> Union["MockRouter", Callable]:
         """
@@ -383,6 +574,9 @@ class MockRouter(Router):
             #   FYI, global ctx `with respx.mock:` hits __enter__ directly
             settings: Dict[str, Any] = {
                 "base_url": base_url,
+                "keep_calls": keep_calls,
+                "clock": clock,
+                "rate_limit": rate_limit,
                 "using": using,
             }
             if assert_all_called is not None:
@@ -0,0 +1,103 @@
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Optional
+
+import httpx
+
+
+class Histogram:
+    """
+    Log-linear histogram of durations, similar to HDR histograms, where each
+    bucket is within 1/16 relative precision of the recorded microseconds.
+    """
+
+    sub_bucket_bits = 4
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: int) -> int:
+        size = 1 << self.sub_bucket_bits
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            return value
+        return shift * size + (value >> shift)
+
+    def _highest_value(self, index: int) -> int:
+        size = 1 << self.sub_bucket_bits
+        if index < size * 2:
+            return index
+        shift = index // size - 1
+        return (((index % size) + size + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        index = self._index(int(seconds * 1_000_000))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the highest duration, in seconds, within the bucket of given percentile.
+        """
+        if not self.count:
+            return 0.0
+
+        assert self.max is not None
+        rank = max(1, round(self.count * percent / 100))
+        indexes = sorted(self._counts)
+        ranks = list(accumulate(self._counts[index] for index in indexes))
+        index = indexes[bisect_left(ranks, rank)]
+        return min(self._highest_value(index) / 1_000_000, self.max)
+
+
+class Stats:
+    """
+    Call stats, aggregated when calls are recorded, without keeping any calls.
+    """
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.status_codes: Dict[int, int] = Counter()
+        self.latency.reset()
+
+    def record(
+        self,
+        response: Optional[httpx.Response],
+        *,
+        matched: bool = True,
+        error: bool = False,
+        elapsed: Optional[float] = None,
+    ) -> None:
+        if matched:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if error:
+            self.errors += 1
+        if response is not None:
+            self.status_codes[response.status_code] += 1
+        if elapsed is not None:
+            self.latency.record(elapsed)
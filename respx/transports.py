@@ -1,27 +1,19 @@
 from types import TracebackType
-from typing import (
-    TYPE_CHECKING,
-    Any,
-    Callable,
-    Coroutine,
-    List,
-    Optional,
-    Type,
-    Union,
-    cast,
-)
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional, Type, Union, cast
 from warnings import warn
 
 import httpx
 from httpx import AsyncBaseTransport, BaseTransport
 
-from .models import PassThrough
+from .models import ResolvedRoute
 
 if TYPE_CHECKING:
     from .router import Router  # pragma: nocover
 
 RequestHandler = Callable[[httpx.Request], httpx.Response]
 AsyncRequestHandler = Callable[[httpx.Request], Coroutine[None, None, httpx.Response]]
+Resolver = Callable[[httpx.Request], ResolvedRoute]
+AsyncResolver = Callable[[httpx.Request], Coroutine[None, None, ResolvedRoute]]
 
 
 class MockTransport(httpx.MockTransport):
@@ -66,28 +58,50 @@ class MockTransport(httpx.MockTransport):
         self.__exit__(*args)
 
 
-class TryTransport(BaseTransport, AsyncBaseTransport):
+class MockerTransport(BaseTransport, AsyncBaseTransport):
+    """
+    Transport resolving requests with given mocker resolvers, falling back to given
+    transport for requests resolved to pass through.
+    """
+
     def __init__(
-        self, transports: List[Union[BaseTransport, AsyncBaseTransport]]
+        self,
+        *,
+        resolve: Resolver,
+        aresolve: AsyncResolver,
+        pass_through: Union[BaseTransport, AsyncBaseTransport],
     ) -> None:
-        self.transports = transports
+        self.resolve = resolve
+        self.aresolve = aresolve
+        self.pass_through = pass_through
 
     def handle_request(self, request: httpx.Request) -> httpx.Response:
-        for transport in self.transports:
-            try:
-                transport = cast(BaseTransport, transport)
-                return transport.handle_request(request)
-            except PassThrough:
-                continue
-
-        raise RuntimeError()  # pragma: nocover
+        resolved = self.resolve(request)
+        if resolved.is_pass_through:
+            transport = cast(BaseTransport, self.pass_through)
+            response = transport.handle_request(request)
+            return self.record(resolved, request, response)
+        return resolved.unwrap(request)
 
     async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
-        for transport in self.transports:
-            try:
-                transport = cast(AsyncBaseTransport, transport)
-                return await transport.handle_async_request(request)
-            except PassThrough:
-                continue
+        resolved = await self.aresolve(request)
+        if resolved.is_pass_through:
+            transport = cast(AsyncBaseTransport, self.pass_through)
+            response = await transport.handle_async_request(request)
+            return self.record(resolved, request, response)
+        return resolved.unwrap(request)
 
-        raise RuntimeError()  # pragma: nocover
+    def record(
+        self, resolved: ResolvedRoute, request: httpx.Request, response: httpx.Response
+    ) -> httpx.Response:
+        stream = resolved.record(
+            request, response.status_code, response.headers.raw, response.stream
+        )
+        if hasattr(response, "_content") and isinstance(
+            response.stream, httpx.ByteStream
+        ):
+            # Record an already read response, e.g. of a mock transport, right away
+            b"".join(stream)
+        else:
+            response.stream = stream
+        return response
@@ -55,6 +55,8 @@ SideEffectTypes = Union[
     Type[Exception],
     Iterator[SideEffectListTypes],
 ]
+LatencyTypes = Union[float, Callable[[], float]]
+OutcomeTypes = Union[int, httpx.Response, Exception, Type[Exception]]
 
 # Borrowed from HTTPX's "private" types.
 FileContent = Union[IO[bytes], bytes, str]
@@ -1,15 +1,25 @@
 import email
+import json as jsonlib
+import mmap
+import os
 from collections import defaultdict
 from datetime import datetime
 from email.message import Message
+from functools import cached_property
+from http.cookies import SimpleCookie
+from random import Random
 from typing import (
     Any,
+    AsyncIterator,
     Dict,
     Iterable,
+    Iterator,
     List,
     Literal,
     NamedTuple,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     Type,
     TypeVar,
@@ -98,6 +108,222 @@ def decode_data(request: httpx.Request) -> Tuple[MultiItems, MultiItems]:
     return data, files
 
 
+def get_scheme_port(scheme: Optional[str]) -> Optional[int]:
+    return {"http": 80, "https": 443}.get(scheme or "")
+
+
+def ensure_path(url: httpx.URL) -> httpx.URL:
+    if not url._uri_reference.path:
+        url = url.copy_with(path="/")
+    return url
+
+
+class RequestView:
+    """
+    Request scoped view, lazily parsing and memoizing request values to match on.
+
+    Unknown attributes are looked up on the wrapped `HTTPX` request.
+    """
+
+    def __init__(self, request: httpx.Request) -> None:
+        self.request = request
+
+    @classmethod
+    def of(cls, request: Union[httpx.Request, "RequestView"]) -> "RequestView":
+        if isinstance(request, RequestView):
+            return request
+        return cls(request)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.request, name)
+
+    @cached_property
+    def method(self) -> str:
+        return self.request.method
+
+    @cached_property
+    def url(self) -> httpx.URL:
+        return self.request.url
+
+    @cached_property
+    def headers(self) -> httpx.Headers:
+        return self.request.headers
+
+    @cached_property
+    def scheme(self) -> str:
+        return self.url.scheme
+
+    @cached_property
+    def host(self) -> str:
+        return self.url.host
+
+    @cached_property
+    def port(self) -> Optional[int]:
+        return self.url.port or get_scheme_port(self.scheme)
+
+    @cached_property
+    def path(self) -> str:
+        return self.url.path
+
+    @cached_property
+    def url_string(self) -> str:
+        return str(ensure_path(self.url))
+
+    @cached_property
+    def params(self) -> httpx.QueryParams:
+        return httpx.QueryParams(self.url.query)
+
+    @cached_property
+    def cookies(self) -> Set[Tuple[str, str]]:
+        cookie_header = self.headers.get("cookie")
+        if not cookie_header:
+            return set()
+
+        cookies: SimpleCookie = SimpleCookie()
+        cookies.load(rawdata=cookie_header)
+
+        return {(cookie.key, cookie.value) for cookie in cookies.values()}
+
+    @cached_property
+    def content(self) -> bytes:
+        return self.request.read()
+
+    @cached_property
+    def json(self) -> Any:
+        return jsonlib.loads(self.content.decode("utf-8"))
+
+    @cached_property
+    def form(self) -> Tuple[MultiItems, MultiItems]:
+        return decode_data(self.request)
+
+    @property
+    def data(self) -> MultiItems:
+        return self.form[0]
+
+    @property
+    def files(self) -> MultiItems:
+        return self.form[1]
+
+
+class FileStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Re-iterable byte stream of a memory-mapped file, or a slice of it, streamed in
+    chunks without reading the whole file into memory.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.start = start
+        self.stop = os.path.getsize(self.path) if stop is None else stop
+        self.size = self.stop - self.start
+
+    def __getitem__(self, key: slice) -> "FileStream":
+        start, stop, _ = key.indices(self.size)
+        return FileStream(self.path, self.start + start, self.start + stop)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if not self.size:
+            return  # Empty files can't be memory-mapped
+
+        with open(self.path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for offset in range(self.start, self.stop, self.chunk_size):
+                    yield buffer[offset : min(offset + self.chunk_size, self.stop)]
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+
+
+class WrappedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Base of byte streams wrapping, and closing, a sync and/or async byte stream.
+    """
+
+    def __init__(
+        self, stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream]
+    ) -> None:
+        self.stream = stream
+
+    def close(self) -> None:
+        if isinstance(self.stream, httpx.SyncByteStream):
+            self.stream.close()
+
+    async def aclose(self) -> None:
+        if isinstance(self.stream, httpx.AsyncByteStream):
+            await self.stream.aclose()
+
+
+def parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Returns the start and stop position of a single byte range `Range` header value,
+    or None when the header should be ignored, e.g. when invalid or multiple ranges.
+
+    Raises ValueError when the range can't be satisfied for given size.
+    """
+    unit, _, byte_range = value.partition("=")
+    first, sep, last = byte_range.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not sep:
+        return None
+    if not (first.isdigit() or not first) or not (last.isdigit() or not last):
+        return None
+
+    if not first:
+        # Suffix range, i.e. last bytes
+        if not last:
+            return None
+        if not int(last) or not size:
+            raise ValueError(f"Unsatisfiable range {value!r}")
+        return max(size - int(last), 0), size
+
+    start = int(first)
+    if last and int(last) < start:
+        return None  # Invalid range
+    if start >= size:
+        raise ValueError(f"Unsatisfiable range {value!r}")
+
+    stop = min(int(last) + 1, size) if last else size
+    return start, stop
+
+
+class AliasTable:
+    """
+    Vose's alias table, sampling indexes of given weights in constant time.
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        if not weights or any(weight < 0 for weight in weights) or not sum(weights):
+            raise ValueError(f"Weights must be positive, got {weights!r}")
+
+        size = len(weights)
+        total = sum(weights)
+        scaled = [weight * size / total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+
+        self.probabilities = [1.0] * size
+        self.aliases = list(range(size))
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+    def sample(self, random: Random) -> int:
+        column = random.randrange(len(self.aliases))
+        if random.random() < self.probabilities[column]:
+            return column
+        return self.aliases[column]
+
+
 Self = TypeVar("Self", bound="SetCookie")
 
 
@@ -2,6 +2,7 @@ import asyncio
 import json as jsonlib
 import re
 import socket
+import traceback
 from unittest import mock
 
 import httpcore
@@ -12,6 +13,7 @@ import respx
 from respx.models import Route
 from respx.patterns import M
 from respx.router import MockRouter
+from respx.utils import FileStream
 
 
 async def test_http_methods(client):
@@ -545,6 +547,35 @@ def test_add():
             route.pattern &= M(params={"foo": "bar"})
 
 
+def test_add_many():
+    with respx.mock:
+        foo = Route(method="GET", url="https://foo.bar/")
+        ham = Route(method="GET", url="https://ham.spam/")
+        assert respx.add_many({"foo": foo, "ham": ham}) == [foo, ham]
+        assert respx.routes["ham"] is ham
+
+        egg = Route(method="POST", url="https://foo.bar/")
+        assert respx.add_many([Route(method="GET", url="https://foo.bar/"), egg]) == [
+            foo,
+            egg,
+        ]
+        assert len(respx.routes) == 3
+        assert "foo" not in respx.routes
+
+        with pytest.raises(ValueError, match="Invalid route"):
+            respx.add_many([Route(method="PUT"), "GET"])  # type: ignore[list-item]
+        assert len(respx.routes) == 3
+
+        with respx.bulk(), respx.bulk():
+            route = respx.get("https://foo.bar/baz/")
+            assert route._matcher is None
+        assert getattr(route, "_matcher") is not None  # noqa: B009
+
+        response = httpx.get("https://foo.bar/baz/")
+        assert response.status_code == 200
+        assert route.called
+
+
 def test_respond():
     with respx.mock:
         route = respx.get("https://foo.bar/").respond(
@@ -564,6 +595,164 @@ def test_respond():
             route.respond(content=Exception())  # type: ignore[arg-type]
 
 
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_respond_with_file(tmp_path, monkeypatch, using):
+    monkeypatch.setattr(FileStream, "chunk_size", 4)
+    path = tmp_path / "foobar.bin"
+    path.write_bytes(b"foobar" * 3)
+    empty_path = tmp_path / "empty.bin"
+    empty_path.write_bytes(b"")
+
+    async with respx.mock(using=using) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(file=path)
+        assert isinstance(route.return_value, httpx.Response)
+        assert isinstance(route.return_value.stream, FileStream)
+
+        response = httpx.get("https://foo.bar/")
+        assert response.headers["Content-Length"] == "18"
+        assert response.content == b"foobar" * 3
+
+        async with httpx.AsyncClient() as client:
+            async with client.stream("GET", "https://foo.bar/") as response:
+                chunks = [chunk async for chunk in response.aiter_raw()]
+        assert chunks == [b"foob", b"arfo", b"obar", b"foob", b"ar"]
+
+        route.respond(file=str(empty_path))
+        response = httpx.get("https://foo.bar/")
+        assert response.headers["Content-Length"] == "0"
+        assert response.content == b""
+
+
+@pytest.mark.parametrize("source", ["content", "file"])
+def test_respond_with_range(tmp_path, source):
+    path = tmp_path / "foobar.bin"
+    path.write_bytes(b"0123456789")
+    headers = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    with respx.mock:
+        route = respx.route(url="https://foo.bar/")
+        if source == "file":
+            route.respond(file=path, headers=headers)
+        else:
+            headers["Accept-Ranges"] = "bytes"
+            route.respond(content=path.read_bytes(), headers=headers)
+
+        response = httpx.get("https://foo.bar/", headers={"Range": "bytes=2-5"})
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == "bytes 2-5/10"
+        assert response.headers["Content-Length"] == "4"
+        assert response.headers["ETag"] == '"v1"'
+        assert response.content == b"2345"
+
+        response = httpx.get("https://foo.bar/", headers={"Range": "bytes=-3"})
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == "bytes 7-9/10"
+        assert response.content == b"789"
+
+        for if_range in ('"v1"', "Wed, 21 Oct 2015 07:28:00 GMT"):
+            response = httpx.get(
+                "https://foo.bar/", headers={"Range": "bytes=8-", "If-Range": if_range}
+            )
+            assert response.status_code == 206
+            assert response.content == b"89"
+
+        for if_range in ('"v2"', 'W/"v1"', "Thu, 22 Oct 2015 07:28:00 GMT"):
+            response = httpx.get(
+                "https://foo.bar/", headers={"Range": "bytes=8-", "If-Range": if_range}
+            )
+            assert response.status_code == 200
+            assert response.content == b"0123456789"
+
+        response = httpx.get("https://foo.bar/", headers={"Range": "bytes=0-1,4-5"})
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+
+        response = httpx.get("https://foo.bar/", headers={"Range": "bytes=10-"})
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == "bytes */10"
+
+        response = httpx.post("https://foo.bar/", headers={"Range": "bytes=2-5"})
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+
+        assert route.call_count == 10
+
+        # Empty content
+        path.write_bytes(b"")
+        if source == "file":
+            route.respond(file=path, headers=headers)
+        else:
+            route.respond(content=b"", headers=headers)
+        for value in ("bytes=-5", "bytes=0-"):
+            response = httpx.get("https://foo.bar/", headers={"Range": value})
+            assert response.status_code == 416
+            assert response.headers["Content-Range"] == "bytes */0"
+
+
+def test_respond_with_range__not_accepted():
+    with respx.mock:
+        route = respx.get("https://foo.bar/").respond(content=b"0123456789")
+        response = httpx.get("https://foo.bar/", headers={"Range": "bytes=2-5"})
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+
+        route.respond(
+            content=iter([b"01234", b"56789"]), headers={"Accept-Ranges": "bytes"}
+        )
+        response = httpx.get("https://foo.bar/", headers={"Range": "bytes=2-5"})
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+
+
+def test_mix():
+    outcomes = {
+        200: 97,
+        httpx.Response(503, json={"error": "unavailable"}): 2,
+        httpx.ConnectTimeout: 1,
+    }
+    with respx.mock(using="httpx") as respx_mock, httpx.Client() as client:
+        route = respx_mock.get(path__regex=r"/(?P<id>\d+)/").mix(outcomes, seed=42)
+        results = []
+        for _ in range(1000):
+            try:
+                results.append(client.get("https://foo.bar/1/").status_code)
+            except httpx.ConnectTimeout as error:
+                assert error.request.url == "https://foo.bar/1/"
+                results.append(0)
+
+        assert route.call_count == 1000
+        assert route.stats.status_codes[200] == results.count(200)
+        assert route.stats.status_codes[503] == results.count(503)
+        assert route.stats.errors == results.count(0)
+        assert 950 < results.count(200) < 990
+        assert 0 < results.count(0) < results.count(503) < 50
+
+        # Reproducible
+        route.mix(outcomes, seed=42)
+        first_error = results.index(0)
+        assert [
+            client.get("https://foo.bar/1/").status_code for _ in range(first_error)
+        ] == results[:first_error]
+
+        stream = httpx.Response(206, content=iter([b"foo", b"bar"]))
+        route.mix([(stream, 1), (ValueError("boom"), 1)], seed=2)
+        assert client.get("https://foo.bar/1/").content == b"foobar"
+        with pytest.raises(ValueError, match="boom"):
+            client.get("https://foo.bar/1/")
+
+        # Exception outcome is raised as a copy, with a bounded traceback
+        outcome = httpx.ReadError("boom")
+        route.mix([(outcome, 1)])
+        depths = []
+        for _ in range(5):
+            with pytest.raises(httpx.ReadError, match="boom") as exc_info:
+                client.get("https://foo.bar/1/")
+            assert exc_info.value is not outcome
+            depths.append(len(traceback.extract_tb(exc_info.value.__traceback__)))
+        assert outcome.__traceback__ is None
+        assert len(set(depths)) == 1
+
+
 def test_can_respond_with_cookies():
     with respx.mock:
         route = respx.get("https://foo.bar/").respond(
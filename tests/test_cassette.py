@@ -0,0 +1,216 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import respx
+from respx.cassette import Cassette, Recorded, RecordingStream, Replay, get_key
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = gzip.compress(self.path.encode())
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        content = self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(201)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content.upper())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_cassette(tmp_path):
+    cassette = Cassette(tmp_path / "cassette")
+    assert cassette.load() == (None, {})
+
+    cassette.path = str(tmp_path)  # Not a file
+    with pytest.raises(IsADirectoryError):
+        cassette.load()
+
+    cassette = Cassette(tmp_path / "cassette")
+    open(cassette.path, "wb").close()
+    assert cassette.load() == (None, {})
+
+    request = httpx.Request("POST", "https://foo.bar/?q=1", content=b"foo")
+    cassette.record(request, 201, [(b"X-Foo", b"bar")], b"foo\nbar")
+    cassette.record(request, 202, [], b"")
+    buffer, index = cassette.load()
+    assert buffer is not None
+    assert list(index) == [get_key(request)]
+
+    replay = Replay(cassette)
+    response = replay(httpx.Request("POST", "https://foo.bar/?q=1", content=b"foo"))
+    assert response is not None
+    assert response.status_code == 201
+    assert response.headers["X-Foo"] == "bar"
+    assert response.read() == b"foo\nbar"
+    for _ in range(2):
+        response = replay(request)
+        assert response is not None
+        assert response.status_code == 202
+    assert replay(httpx.Request("POST", "https://foo.bar/?q=1")) is None
+    assert replay(httpx.Request("GET", "https://foo.bar/?q=1")) is None
+
+    pattern = Recorded(replay)
+    assert pattern.match(request)
+    assert not pattern.match(httpx.Request("GET", "https://foo.bar/?q=1"))
+    assert pattern == Recorded(Replay(Cassette(cassette.path)))
+
+    # Ignore partially written interaction
+    with open(cassette.path, "rb") as file:
+        content = file.read()
+    for partial in (b"GET https://foo.bar/ 0 10 10\n{}", b"GET https://foo.bar/"):
+        with open(cassette.path, "wb") as file:
+            file.write(content + partial)
+        assert len(cassette.load()[1]) == 1
+
+
+async def test_recording_stream(tmp_path):
+    cassette = Cassette(tmp_path / "cassette")
+    request = httpx.Request("GET", "https://foo.bar/")
+    stream = RecordingStream(httpx.ByteStream(b"foo"), cassette, request, 200, [])
+    assert cassette.load()[1] == {}
+    assert b"".join(stream) == b"foo"
+    assert b"".join([chunk async for chunk in stream]) == b"foo"
+    stream.close()
+    await stream.aclose()
+    RecordingStream([b"foo"], cassette, request, 200, []).close()
+    await RecordingStream([b"foo"], cassette, request, 200, []).aclose()
+    assert len(cassette.load()[1][get_key(request)]) == 2
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_record_and_replay(tmp_path, server_url, using):
+    path = tmp_path / "cassette"
+
+    async with respx.mock(using=using) as respx_mock:
+        route = respx_mock.route(url__startswith=server_url).record(path)
+        assert route.is_pass_through
+
+        response = httpx.get(f"{server_url}/foo/")
+        assert response.text == "/foo/"
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{server_url}/bar/", content=b"bar")
+            assert response.status_code == 201
+            assert response.text == "BAR"
+        assert route.call_count >= 2
+
+    assert len(Cassette(path).load()[1]) == 2
+
+    async with respx.mock(using=using) as respx_mock:
+        route = respx_mock.replay(path)
+
+        response = httpx.get(f"{server_url}/foo/")
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.text == "/foo/"
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{server_url}/bar/", content=b"bar")
+            assert response.status_code == 201
+            assert response.text == "BAR"
+
+            with pytest.raises(respx.models.AllMockedAssertionError):
+                await client.post(f"{server_url}/bar/", content=b"baz")
+
+
+def test_replay_with_recording_fallback__same_pattern(tmp_path, server_url):
+    # Documented in guide, i.e. replay and recording routes with same pattern
+    host = httpx.URL(server_url).host
+    for _ in range(2):
+        with respx.mock:
+            cassette = respx.Cassette(tmp_path / "cassette")
+            replay_route = respx.replay(cassette, host=host)
+            record_route = respx.route(host=host).record(cassette)
+            assert replay_route is not record_route
+            response = httpx.get(f"{server_url}/foo/")  # Replayed once recorded
+            assert response.text == "/foo/"
+
+    assert replay_route.call_count == 1
+    assert record_route.call_count == 0
+    assert len(Cassette(tmp_path / "cassette").load()[1]) == 1
+
+
+def test_record__not_streamed(tmp_path):
+    path = tmp_path / "cassette"
+
+    def handler(request):
+        return httpx.Response(200, text="foo")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with respx.mock(using="httpx") as respx_mock:
+        route = respx_mock.get("https://foo.bar/").record(str(path))
+        with client.stream("GET", "https://foo.bar/") as response:
+            pass  # Closed without reading
+        assert response.is_closed
+        assert client.get("https://foo.bar/").text == "foo"
+
+        respx_mock.snapshot()
+        route.respond(204)
+        assert route._cassette is None
+        respx_mock.rollback()
+        assert getattr(route, "_cassette") is not None  # noqa: B009
+
+    assert len(Cassette(path).load()[1]) == 1
+
+
+def test_record__replaced_route(tmp_path):
+    path = tmp_path / "cassette"
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(204))
+    )
+    with respx.mock(using="httpx") as respx_mock:
+        route = respx_mock.get("https://foo.bar/", name="foo").pass_through()
+        replacement = respx.Route(url="https://foo.bar/").record(path)
+        assert respx_mock.add(replacement, name="foo") is route
+        assert route.is_pass_through
+        assert client.get("https://foo.bar/").status_code == 204
+
+    assert len(Cassette(path).load()[1]) == 1
+
+
+def test_replay_with_recording_fallback(tmp_path):
+    path = tmp_path / "cassette"
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=request.url.path)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    cassette = Cassette(path)
+    for _ in range(2):
+        with respx.mock(using="httpx", assert_all_called=False) as respx_mock:
+            respx_mock.replay(cassette, host="foo.bar")
+            respx_mock.get(host="foo.bar").record(cassette)
+            respx_mock.get(host="ham.spam").pass_through()
+            assert client.get("https://foo.bar/a/").text == "/a/"
+            assert client.get("https://foo.bar/b/").text == "/b/"
+            assert client.get("https://ham.spam/c/").text == "/c/"
+
+    assert len(requests) == 4
+    assert len(cassette.load()[1]) == 2
+
+    with respx.mock:
+        route = respx.replay(path)
+        assert httpx.get("https://foo.bar/a/").text == "/a/"
+        assert route.call_count == 1
@@ -0,0 +1,158 @@
+import random
+import time
+from functools import partial
+
+import httpx
+import pytest
+
+import respx
+from respx.clock import Clock, ThrottledStream, VirtualClock
+
+
+async def test_clock():
+    clock = Clock()
+    started = clock.time()
+    clock.sleep(0.001)
+    await clock.asleep(0.001)
+    assert clock.time() - started >= 0.002
+
+
+async def test_virtual_clock():
+    clock = VirtualClock()
+    assert clock.time() == 0.0
+    clock.sleep(60)
+    await clock.asleep(0.5)
+    assert clock.time() == 60.5
+    assert VirtualClock(start=10).time() == 10
+
+
+async def test_throttled_stream():
+    clock = VirtualClock()
+    stream = ThrottledStream(httpx.ByteStream(b"x" * 1000), 100, clock)
+    assert b"".join(stream) == b"x" * 1000
+    assert clock.time() == 10.0
+    assert b"".join([chunk async for chunk in stream]) == b"x" * 1000
+    assert clock.time() == 20.0
+    stream.close()
+    await stream.aclose()
+
+    # Only close wrapped stream of matching kind
+    ThrottledStream(httpx.SyncByteStream(), 100, clock).close()
+    await ThrottledStream(httpx.SyncByteStream(), 100, clock).aclose()
+    ThrottledStream(httpx.AsyncByteStream(), 100, clock).close()
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_latency(using):
+    clock = VirtualClock()
+    async with respx.mock(using=using, clock=clock) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(204, latency=90)
+
+        async with httpx.AsyncClient(timeout=None) as client:
+            response = await client.get("https://foo.bar/")
+        assert response.status_code == 204
+        assert clock.time() == 90
+
+        with httpx.Client(timeout=None) as client:
+            response = client.get("https://foo.bar/")
+        assert response.status_code == 204
+        assert clock.time() == 180
+
+        assert route.stats.latency.mean == 90
+        assert respx_mock.stats.latency.max == 90
+
+        route.respond(latency=partial(random.Random(7).uniform, 1, 2))
+        httpx.get("https://foo.bar/")
+        httpx.get("https://foo.bar/")
+        assert 182 < clock.time() < 184
+
+        route.respond(latency=lambda: -1)
+        httpx.get("https://foo.bar/")
+        assert 182 < clock.time() < 184
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_latency__timeout(using):
+    clock = VirtualClock()
+    async with respx.mock(using=using, clock=clock) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(latency=10)
+
+        with pytest.raises(httpx.ReadTimeout):
+            httpx.get("https://foo.bar/", timeout=2)
+        assert clock.time() == 2
+
+        async with httpx.AsyncClient(timeout=3) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get("https://foo.bar/")
+        assert clock.time() == 5
+
+        response = httpx.get("https://foo.bar/", timeout=httpx.Timeout(1, read=10))
+        assert response.status_code == 200
+        assert clock.time() == 15
+
+        assert route.call_count == 3
+        assert route.stats.errors == 2
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_bandwidth(tmp_path, using):
+    path = tmp_path / "foobar.bin"
+    path.write_bytes(b"x" * 500)
+
+    clock = VirtualClock()
+    async with respx.mock(using=using, clock=clock) as respx_mock:
+        route = respx_mock.get("https://foo.bar/")
+        route.respond(content=b"x" * 1000, latency=1, bandwidth=100)
+
+        response = httpx.get("https://foo.bar/")
+        assert response.content == b"x" * 1000
+        assert clock.time() == 11
+
+        async with httpx.AsyncClient() as client:
+            response = await client.get("https://foo.bar/")
+        assert response.content == b"x" * 1000
+        assert clock.time() == 22
+
+        route.respond(file=path, bandwidth=50)
+        response = httpx.get("https://foo.bar/")
+        assert response.content == b"x" * 500
+        assert clock.time() == 32
+
+        with pytest.raises(ValueError, match="Bandwidth must be positive"):
+            route.respond(bandwidth=0)
+
+
+def test_real_latency():
+    with respx.mock:
+        respx.get("https://foo.bar/").respond(latency=0.01)
+        started = time.perf_counter()
+        httpx.get("https://foo.bar/")
+        assert time.perf_counter() - started >= 0.01
+
+
+def test_latency_rollback():
+    with respx.mock(assert_all_called=False, clock=VirtualClock()) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(latency=5, bandwidth=10)
+        respx_mock.snapshot()
+        route.respond()
+        assert route._get_latency() == 0.0
+        respx_mock.rollback()
+        assert route._get_latency() == 5
+        assert route._bandwidth == 10
+
+
+def test_latency__replaced_route():
+    clock = VirtualClock()
+    with respx.mock(clock=clock) as respx_mock:
+        route = respx_mock.get("https://foo.bar/", name="foo") % 204
+        fault = respx.StreamFault(after_bytes=1)
+        replacement = respx.Route(url="https://foo.bar/").respond(
+            201, content=b"foo", latency=5.0, bandwidth=10, fault=fault
+        )
+        assert respx_mock.add(replacement, name="foo") is route
+        assert route._bandwidth == 10
+        assert route._fault is fault
+
+        with pytest.raises(httpx.ReadError):
+            httpx.get("https://foo.bar/", timeout=None)
+        assert clock.time() == pytest.approx(5.1)  # Latency, and 1 byte at 10 B/s
@@ -0,0 +1,129 @@
+import httpx
+import pytest
+
+import respx
+from respx.clock import VirtualClock
+from respx.faults import FaultyStream, StreamFault
+
+CHUNKS = [b"abc", b"def", b"ghi"]
+
+
+async def aiter_chunks():
+    for chunk in CHUNKS:
+        yield chunk
+
+
+@pytest.mark.parametrize(
+    ("fault", "expected", "position"),
+    [
+        (StreamFault(), b"abcdefghi", None),
+        (StreamFault(after_bytes=4), b"abcd", 4),
+        (StreamFault(after_bytes=6), b"abcdef", 6),
+        (StreamFault(after_bytes=9), b"abcdefghi", None),
+        (StreamFault(after_bytes=0), b"", 0),
+        (StreamFault(after_chunks=1), b"abc", 3),
+        (StreamFault(after_chunks=3), b"abcdefghi", None),
+        (StreamFault(after_bytes=5, after_chunks=1), b"abc", 3),
+    ],
+)
+async def test_faulty_stream(fault, expected, position):
+    request = httpx.Request("GET", "https://foo.bar/")
+    stream = FaultyStream(httpx.ByteStream(b""), fault, VirtualClock(), request)
+    stream.stream = iter(CHUNKS)  # type: ignore[assignment]
+
+    content = b""
+    if position is None:
+        content = b"".join(stream)
+    else:
+        with pytest.raises(httpx.ReadError, match=f"after {position} bytes") as e:
+            for chunk in stream:
+                content += chunk
+        assert e.value.request is request
+    assert content == expected
+
+    stream.stream = aiter_chunks()
+    content = b""
+    if position is None:
+        content = b"".join([chunk async for chunk in stream])
+    else:
+        with pytest.raises(httpx.ReadError, match=f"after {position} bytes"):
+            async for chunk in stream:
+                content += chunk
+    assert content == expected
+
+
+async def test_faulty_stream__stall():
+    clock = VirtualClock()
+    request = httpx.Request("GET", "https://foo.bar/")
+    fault = StreamFault(stall=10)
+    stream = FaultyStream(httpx.ByteStream(b"abc"), fault, clock, request)
+    assert b"".join(stream) == b"abc"
+    assert clock.time() == 0
+
+    stream.stream = iter(CHUNKS)  # type: ignore[assignment]
+    assert b"".join(stream) == b"abcdefghi"
+    assert clock.time() == 20
+
+    request.extensions["timeout"] = {"read": 4}
+    stream.stream = iter(CHUNKS)  # type: ignore[assignment]
+    with pytest.raises(httpx.ReadTimeout):
+        b"".join(stream)
+    assert clock.time() == 24
+
+    stream.stream = aiter_chunks()
+    with pytest.raises(httpx.ReadTimeout):
+        b"".join([chunk async for chunk in stream])
+    assert clock.time() == 28
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_stream_fault(using):
+    clock = VirtualClock()
+    async with respx.mock(using=using, clock=clock) as respx_mock:
+        route = respx_mock.get("https://foo.bar/")
+        route.respond(
+            stream=httpx.ByteStream(b"0123456789"),
+            headers={"Accept-Ranges": "bytes"},
+            fault=StreamFault(after_bytes=4, error=httpx.RemoteProtocolError),
+        )
+
+        with pytest.raises(httpx.RemoteProtocolError):
+            httpx.get("https://foo.bar/")
+
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(httpx.RemoteProtocolError):
+                await client.get("https://foo.bar/")
+
+        # Resume partial transfer
+        content = b""
+        with httpx.Client() as client:
+            while True:
+                headers = {"Range": f"bytes={len(content)}-"}
+                try:
+                    with client.stream("GET", "https://foo.bar/", headers=headers) as r:
+                        for chunk in r.iter_bytes():
+                            content += chunk
+                except httpx.RemoteProtocolError:
+                    continue
+                break
+
+        assert content == b"0123456789"
+        assert route.call_count == 5
+
+        route.respond(
+            content=[b"foo", b"bar"], fault=StreamFault(after_chunks=1, stall=5)
+        )
+        with pytest.raises(httpx.ReadError):
+            httpx.get("https://foo.bar/")
+        assert clock.time() == 5
+
+
+def test_stream_fault_rollback():
+    with respx.mock(assert_all_called=False) as respx_mock:
+        fault = StreamFault(after_bytes=1)
+        route = respx_mock.get("https://foo.bar/").respond(fault=fault)
+        respx_mock.snapshot()
+        route.respond()
+        assert route._fault is None
+        respx_mock.rollback()
+        assert route._fault is fault
@@ -0,0 +1,134 @@
+import base64
+import io
+import json
+
+import httpx
+import pytest
+
+import respx
+from respx.har import JSONReader, iter_entries
+from respx.utils import RequestView
+
+
+def entry(method, url, status, text="", post_data=None, headers=(), **content):
+    request = {"method": method, "url": url, "headers": []}
+    if post_data is not None:
+        request["postData"] = {"mimeType": "text/plain", "text": post_data}
+    return {
+        "startedDateTime": "2024-01-01T00:00:00.000Z",
+        "request": request,
+        "response": {
+            "status": status,
+            "headers": [{"name": name, "value": value} for name, value in headers],
+            "content": dict(content, text=text),
+        },
+    }
+
+
+@pytest.fixture
+def har_path(tmp_path):
+    path = tmp_path / "example.har"
+    har = {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "test", "version": "1.0"},
+            "pages": [{"id": "page_1", "title": "entries"}],
+            "entries": [
+                entry(
+                    "GET",
+                    "https://foo.bar/?page=1",
+                    200,
+                    '{"page": 1}',
+                    headers=[
+                        (":status", "200"),
+                        ("Content-Type", "application/json"),
+                        ("Content-Encoding", "gzip"),
+                        ("Content-Length", "7"),
+                    ],
+                ),
+                entry("GET", "https://foo.bar/?page=2", 200, "first"),
+                entry("POST", "https://foo.bar/", 201, "ham", post_data="ham"),
+                entry("POST", "https://foo.bar/", 202, "egg", post_data="egg"),
+                entry("GET", "https://foo.bar/?page=2", 200, "last"),
+                entry("GET", "https://foo.bar/aborted/", 0),
+                entry(
+                    "GET",
+                    "https://foo.bar/logo.png",
+                    200,
+                    base64.b64encode(b"\x89PNG").decode(),
+                    encoding="base64",
+                ),
+            ],
+        },
+        "comment": "after entries",
+    }
+    path.write_text(json.dumps(har, indent=2), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 2**16])
+def test_json_reader(chunk_size):
+    document = ' { "a" : [1, 12345, {"b": [] } , [ ] ], "c": {}, "d": 3.25 } '
+    reader = JSONReader(io.StringIO(document), chunk_size=chunk_size)
+    items = []
+    for key in reader.iter_object():
+        if key == "a":
+            items.append([reader.decode() for _ in reader.iter_array()])
+        else:
+            items.append(reader.decode())
+    assert items == [[1, 12345, {"b": []}, []], {}, 3.25]
+    assert reader.peek() == ""
+    assert reader.peek() == ""
+
+    reader = JSONReader(io.StringIO("{}"), chunk_size=chunk_size)
+    assert list(reader.iter_object()) == []
+
+    reader = JSONReader(io.StringIO('{"a" 1}'), chunk_size=chunk_size)
+    with pytest.raises(json.JSONDecodeError, match="Expecting ':'"):
+        list(reader.iter_object())
+
+    reader = JSONReader(io.StringIO('[{"a": 1'), chunk_size=chunk_size)
+    with pytest.raises(json.JSONDecodeError):
+        [reader.decode() for _ in reader.iter_array()]
+
+
+def test_iter_entries(har_path, tmp_path):
+    assert len(list(iter_entries(har_path))) == 7
+
+    path = tmp_path / "empty.har"
+    path.write_text('{"log": {"entries": []}}')
+    assert list(iter_entries(path)) == []
+
+
+def test_load_har(har_path):
+    with respx.mock(assert_all_called=False) as respx_mock:
+        routes = respx_mock.load_har(har_path)
+        assert len(routes) == 5
+        assert len(respx_mock.routes) == 5
+
+        response = httpx.get("https://foo.bar/?page=1")
+        assert response.json() == {"page": 1}
+        assert response.headers["Content-Type"] == "application/json"
+        assert "Content-Encoding" not in response.headers
+
+        # Repeated request mocks last response
+        assert httpx.get("https://foo.bar/?page=2").text == "last"
+
+        response = httpx.post("https://foo.bar/", content=b"egg")
+        assert response.status_code == 202
+        assert response.text == "egg"
+        assert httpx.post("https://foo.bar/", content=b"ham").status_code == 201
+        assert httpx.get("https://foo.bar/logo.png").content == b"\x89PNG"
+
+        with pytest.raises(respx.models.AllMockedAssertionError):
+            httpx.get("https://foo.bar/aborted/")
+        with pytest.raises(respx.models.AllMockedAssertionError):
+            httpx.get("https://foo.bar/?page=3")
+
+        # Query params are looked up by index
+        request = httpx.Request("GET", "https://foo.bar/?page=1")
+        assert respx_mock.routes.candidates(RequestView(request)) == [routes[0]]
+
+    with respx.mock:
+        respx.load_har(har_path)
+        assert httpx.get("https://foo.bar/?page=1").status_code == 200
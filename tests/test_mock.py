@@ -1,4 +1,5 @@
 from contextlib import ExitStack as does_not_raise
+from functools import cached_property
 
 import httpcore
 import httpx
@@ -6,9 +7,10 @@ import pytest
 
 import respx
 from respx import ASGIHandler, WSGIHandler
-from respx.mocks import Mocker
-from respx.models import AllMockedAssertionError
+from respx.mocks import HTTPCoreMocker, HTTPCoreRequestView, HTTPXMocker, Mocker
+from respx.models import AllMockedAssertionError, PassThrough
 from respx.router import MockRouter
+from respx.utils import RequestView
 
 
 @respx.mock
@@ -568,6 +570,45 @@ def test_sync_httpx_mocker():
         test()
 
 
+def test_httpx_mocker__transports():
+    client = httpx.Client()
+    with respx.mock(using="httpx") as respx_mock:
+        respx_mock.get(host="foo.bar") % 204
+        transport = client._transport_for_url(httpx.URL("https://foo.bar/"))
+        assert client._transport_for_url(httpx.URL("https://foo.bar/baz/")) is transport
+        assert (
+            client._transport_for_url(httpx.URL("https://ham.spam/")) is not transport
+        )
+        assert client.get("https://foo.bar/").status_code == 204
+
+        with respx.mock(using="httpx"):
+            _transport = client._transport_for_url(httpx.URL("https://foo.bar/"))
+            assert _transport is not transport
+
+    assert HTTPXMocker._transports.get(client) is None
+
+
+async def test_httpx_mocker__handler():
+    with respx.mock(using="httpx") as respx_mock:
+        respx_mock.get("https://foo.bar/") % 204
+        respx_mock.get("https://pass.through/").pass_through()
+
+        request = httpx.Request("GET", "https://foo.bar/")
+        assert HTTPXMocker.handler(request).status_code == 204
+        response = await HTTPXMocker.async_handler(request)
+        assert response.status_code == 204
+
+        request = httpx.Request("GET", "https://pass.through/")
+        with pytest.raises(PassThrough):
+            HTTPXMocker.handler(request)
+        with pytest.raises(PassThrough):
+            await HTTPXMocker.async_handler(request)
+
+        request = httpx.Request("GET", "https://not.mocked/")
+        with pytest.raises(AllMockedAssertionError):
+            HTTPXMocker.handler(request)
+
+
 async def test_async_httpx_mocker():
     class TestTransport(httpx.AsyncBaseTransport):
         async def handle_async_request(self, *args, **kwargs):
@@ -608,6 +649,29 @@ async def test_async_httpx_mocker():
         await test()
 
 
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_streamed_request_content(client, using):
+    chunks = []
+
+    async def content():
+        for chunk in (b"foo", b"bar"):
+            chunks.append(chunk)
+            yield chunk
+
+    async with respx.mock(using=using, assert_all_called=False) as respx_mock:
+        route = respx_mock.post("https://foo.bar/") % 201
+        response = await client.post("https://foo.bar/", content=content())
+        assert response.status_code == 201
+        assert route.called
+        assert chunks == []  # Not read
+
+        respx_mock.post("https://foo.bar/", content=b"foobar") % 202
+        response = await client.post("https://foo.bar/", content=content())
+        assert response.status_code == 201
+        assert chunks == [b"foo", b"bar"]
+        assert route.calls.last.request.content == b"foobar"
+
+
 @pytest.mark.parametrize("using", ["httpcore", "httpx"])
 async def test_async_side_effect(client, using):
     async def effect(request, slug):
@@ -730,3 +794,93 @@ async def test_route_rollback():
         async with httpx.AsyncClient(base_url="https://example.org/") as client:
             response = await client.delete("/foobar/")
             assert response.status_code == 202
+
+
+@pytest.mark.parametrize(
+    ("scheme", "host", "port", "target"),
+    [
+        (b"https", b"foo.bar", None, b"/"),
+        (b"HTTP", b"Foo.Bar", 8080, b"/baz/?ham=spam&egg"),
+        (b"https", b"foo.bar", 443, b"/a%20b/%F0%9F%A6%80?q=%20"),
+        (b"https", b"foo.bar", None, b"?ham=spam"),
+        (b"https", b"xn--mnchen-3ya.de", None, b"/"),
+        (b"http", b"::1", 8000, b"/baz/"),
+        (b"http", b"[::1]", None, b"/baz/"),
+        (b"https", b"foo.bar", None, b"/a/../b/?c=/../"),
+        (b"https", b"foo.bar", None, b"/x/./y/."),
+        (b"https", b"foo.bar", None, b"/a/.b/c../%2E%2E/"),
+    ],
+)
+def test_httpcore_request_view(scheme, host, port, target):
+    raw_request = httpcore.Request(
+        b"POST",
+        httpcore.URL(scheme=scheme, host=host, port=port, target=target),
+        headers=[(b"Content-Type", b"text/plain")],
+        content=b"foobar",
+    )
+    view = HTTPCoreRequestView(raw_request)
+    assert "request" not in view.__dict__
+    for name in ("method", "scheme", "host", "port", "path", "params", "headers"):
+        getattr(view, name)
+    assert "request" not in view.__dict__
+    if not host.startswith((b"xn--", b"[")) and b"/." not in target:
+        assert "url" not in view.__dict__
+
+    request = HTTPCoreMocker.to_httpx_request(request=raw_request)
+    expected = RequestView(request)
+    assert view.method == expected.method == "POST"
+    assert view.scheme == expected.scheme
+    assert view.host == expected.host
+    assert view.port == expected.port
+    assert view.path == expected.path
+    assert view.params == expected.params
+    assert view.headers == expected.headers
+    assert view.url_string == expected.url_string
+    assert view.request.read() == request.read() == b"foobar"
+
+
+def test_httpcore_request_view__request_not_created(monkeypatch):
+    created = []
+    create_request = HTTPCoreRequestView.__dict__["request"].func
+
+    def create(view):
+        created.append(view)
+        return create_request(view)
+
+    prop = cached_property(create)
+    prop.__set_name__(HTTPCoreRequestView, "request")
+    monkeypatch.setattr(HTTPCoreRequestView, "request", prop)
+
+    with respx.mock(using="httpcore", keep_calls=0) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(201, json={"foo": "bar"})
+        with httpx.Client() as client:
+            for _ in range(10):
+                response = client.get("https://foo.bar/")
+                assert response.json() == {"foo": "bar"}
+        assert route.call_count == 10
+    assert created == []
+
+    with respx.mock(using="httpcore") as respx_mock:
+        route = respx_mock.get("https://foo.bar/") % 204
+        httpx.get("https://foo.bar/")
+        httpx.get("https://foo.bar/")
+        assert created == []
+
+        # Calls compare, and hash, without creating requests
+        first, last = route.calls
+        assert last != first
+        assert last == route.calls.last
+        assert last != "foo"
+        assert len({first, last}) == 2
+        assert created == []
+
+        # Created when the recorded call is accessed
+        request, response = last
+        assert created == [tuple.__getitem__(last, 0)]
+        assert request.url == "https://foo.bar/"
+        assert response.request is request
+        assert last == (request, response)
+        assert last._asdict() == {"request": request, "optional_response": response}
+        assert last._replace(optional_response=None) == (request, None)
+        assert last[0] is request
+        assert isinstance(last, tuple)
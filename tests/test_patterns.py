@@ -16,6 +16,7 @@ from respx.patterns import (
     Host,
     Lookup,
     M,
+    Match,
     Method,
     Noop,
     Params,
@@ -26,6 +27,7 @@ from respx.patterns import (
     merge_patterns,
     parse_url_patterns,
 )
+from respx.utils import RequestView
 
 
 def test_bitwise_and():
@@ -69,6 +71,73 @@ def test_match_context():
     assert match.context == {"host": "foo.bar", "slug": "baz"}
 
 
+class CustomHost(Pattern):
+    key = "custom_host"
+
+    def parse(self, request):
+        return request.url.host
+
+    def _eq(self, value):
+        return Match(value.endswith(self.value), host=value)
+
+
+def based(pattern, base):
+    pattern.base = base
+    return pattern
+
+
+@pytest.mark.parametrize(
+    ("pattern", "context"),
+    [
+        (Noop(), {}),
+        (Method("GET"), {}),
+        (Method("POST"), None),
+        (Method(["POST", "GET"], Lookup.IN), {}),
+        (Path("/ba", Lookup.STARTS_WITH), {}),
+        (URL(r"/(?P<slug>\w+)/", Lookup.REGEX), {"slug": "baz"}),
+        (Content(b"spam", Lookup.CONTAINS), {}),
+        (Cookies({"egg": "ham"}, Lookup.CONTAINS), {}),
+        (Cookies({"egg": "spam"}, Lookup.CONTAINS), None),
+        (Params({"ham": "spam"}), {}),
+        (Params({"ham": "<ANY>"}), {}),
+        (Params({"ham": "egg"}, Lookup.CONTAINS), None),
+        (Headers({"host": "foo.bar"}, Lookup.CONTAINS), {}),
+        (Headers({"host": "foo.bar"}, Lookup.EQUAL), None),
+        (JSON({"ham": "spam"}), None),
+        (CustomHost("bar"), {"host": "foo.bar"}),
+        (CustomHost("ham"), None),
+        (Method("POST") | Host("foo.bar"), {}),
+        (Method("POST") | Host("ham.spam"), None),
+        (
+            M(path__regex=r"/(?P<slug>\w+)/") & Method("GET") & CustomHost("bar"),
+            {"slug": "baz", "host": "foo.bar"},
+        ),
+        (M(path__regex=r"/(?P<slug>\w+)/") & Method("POST"), None),
+        (~Method("POST"), {}),
+        (~Method("GET"), None),
+        (~~M(path__regex=r"/(?P<slug>\w+)/"), {"slug": "baz"}),
+        (based(Path("/"), Path("/baz", Lookup.STARTS_WITH)), {}),
+        (based(Path("/"), Path("/ham", Lookup.STARTS_WITH)), None),
+        (based(JSON({}), JSON({})), None),
+    ],
+)
+def test_compile(pattern, context):
+    request = httpx.Request(
+        "GET",
+        "https://foo.bar/baz/?ham=spam",
+        cookies={"egg": "ham"},
+        content=b"ham spam",
+    )
+    matcher = pattern.compile()
+    match = pattern.match(request)
+    if context is None:
+        assert matcher(RequestView(request)) is None
+        assert not match
+    else:
+        assert matcher(RequestView(request)) == context
+        assert match.context == context
+
+
 def test_noop_pattern():
     assert bool(Noop()) is False
     assert bool(Noop().match(httpx.Request("GET", "https://example.org"))) is True
@@ -0,0 +1,143 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+import respx
+from respx.clock import VirtualClock
+from respx.ratelimit import RateLimit
+
+
+def test_rate_limit():
+    clock = VirtualClock()
+    rate_limit = RateLimit(2, burst=3, clock=clock)
+    request = httpx.Request("GET", "https://foo.bar/")
+
+    assert [rate_limit.throttle(request) for _ in range(3)] == [None] * 3
+    response = rate_limit.throttle(request)
+    assert response is not None
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.request is request
+    assert rate_limit.throttled == 1
+
+    clock.sleep(0.5)
+    assert rate_limit.throttle(request) is None
+    assert rate_limit.throttle(request) is not None
+
+    clock.sleep(60)  # Refills up to burst
+    assert [rate_limit.throttle(request) for _ in range(3)] == [None] * 3
+    assert rate_limit.throttle(request) is not None
+    assert rate_limit.throttled == 3
+
+    rate_limit.reset()
+    assert rate_limit.throttled == 0
+    assert rate_limit.throttle(request) is None
+
+    slow = RateLimit(0.1, clock=clock)
+    assert slow.burst == 1
+    assert slow.throttle(request) is None
+    response = slow.throttle(request)
+    assert response is not None
+    assert response.headers["Retry-After"] == "10"
+
+
+@pytest.mark.parametrize(
+    ("key", "throttled"),
+    [
+        (None, 2),
+        ("host", 1),
+        (lambda request: request.url.path, 0),
+    ],
+)
+def test_rate_limit__key(key, throttled):
+    rate_limit = RateLimit(1, key=key, clock=VirtualClock())
+    for url in ("https://foo.bar/a/", "https://foo.bar/b/", "https://ham.spam/c/"):
+        rate_limit.throttle(httpx.Request("GET", url))
+    assert rate_limit.throttled == throttled
+
+
+def test_rate_limit__invalid():
+    with pytest.raises(ValueError, match="Rate must be positive"):
+        RateLimit(0)
+    with pytest.raises(ValueError, match="Key must be 'host' or a callable"):
+        RateLimit(1, key="path")
+
+
+def test_rate_limit__threads():
+    rate_limit = RateLimit(1, burst=100, clock=VirtualClock())
+    request = httpx.Request("GET", "https://foo.bar/")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: rate_limit.throttle(request), range(500)))
+    assert results.count(None) == 100
+    assert rate_limit.throttled == 400
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_route_rate_limit(using):
+    clock = VirtualClock()
+    rate_limit = RateLimit(1, burst=2, clock=clock)
+    async with respx.mock(
+        using=using, clock=clock, assert_all_called=False
+    ) as respx_mock:
+        route = respx_mock.get("https://foo.bar/", name="foo")
+        route.throttle(rate_limit).side_effect = [httpx.Response(201)] * 3
+
+        async with httpx.AsyncClient() as client:
+            responses = await asyncio.gather(
+                *(client.get("https://foo.bar/") for _ in range(3))
+            )
+        assert sorted(r.status_code for r in responses) == [201, 201, 429]
+
+        clock.sleep(1)
+        assert httpx.get("https://foo.bar/").status_code == 201
+        assert route.call_count == 4
+        assert route.stats.status_codes == {201: 3, 429: 1}
+        assert rate_limit.throttled == 1
+
+        respx_mock.snapshot()
+        route.throttle(None)
+        respx_mock.rollback()
+        assert route._rate_limit is rate_limit
+
+        route.reset()
+        assert rate_limit.throttled == 0
+
+
+def test_route_rate_limit__replaced_route():
+    rate_limit = RateLimit(1, clock=VirtualClock())
+    with respx.mock as respx_mock:
+        route = respx_mock.get("https://foo.bar/", name="foo") % 201
+        replacement = respx.Route(url="https://foo.bar/").throttle(rate_limit) % 202
+        assert respx_mock.add(replacement, name="foo") is route
+        assert route._rate_limit is rate_limit
+
+        assert httpx.get("https://foo.bar/").status_code == 202
+        assert httpx.get("https://foo.bar/").status_code == 429
+
+
+def test_router_rate_limit():
+    clock = VirtualClock()
+    rate_limit = RateLimit(1, key="host", clock=clock)
+    with respx.mock(
+        clock=clock, rate_limit=rate_limit, assert_all_called=False
+    ) as respx_mock:
+        foo = respx_mock.get("https://foo.bar/", name="foo") % 201
+        ham = respx_mock.get("https://ham.spam/", name="ham").pass_through()
+
+        assert httpx.get("https://foo.bar/").status_code == 201
+        response = httpx.get("https://foo.bar/")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert foo.call_count == 2
+        assert foo.stats.status_codes == {201: 1, 429: 1}
+
+        # Pass-through routes aren't rate limited
+        with pytest.raises(httpx.ConnectError):
+            httpx.get("https://ham.spam/")
+        assert ham.called
+
+        assert rate_limit.throttled == 1
+        respx_mock.reset()
+        assert rate_limit.throttled == 0
@@ -1,12 +1,19 @@
+import gzip
+import inspect
+import itertools
+import re
 import warnings
+from unittest import mock
 
 import httpcore
 import httpx
 import pytest
 
-from respx import Route, Router
-from respx.models import AllMockedAssertionError, PassThrough, RouteList
+from respx import MockRouter, Route, Router
+from respx.index import PrefixIndex, RegexIndex, get_regex_source
+from respx.models import AllMockedAssertionError, PassThrough, RouteList, clone_response
 from respx.patterns import Host, M, Method
+from respx.utils import RequestView
 
 
 async def test_empty_router():
@@ -89,6 +96,38 @@ def test_pass_through():
     assert resolved.response is not None
 
 
+async def test_resolve__unresolved():
+    router = Router()
+    route = router.get("https://foo.bar/").pass_through()
+
+    request = httpx.Request("GET", "https://foo.bar/")
+    resolved = router._resolve(request)
+    assert resolved.is_mocked
+    assert resolved.is_pass_through
+    assert resolved.route is route
+    with pytest.raises(PassThrough):
+        resolved.unwrap(request)
+
+    with pytest.raises(PassThrough):
+        with router.resolver(request) as resolved:
+            resolved.route = route
+            resolved.response = request
+
+    request = httpx.Request("GET", "https://ham.spam/")
+    resolved = await router._aresolve(request)
+    assert not resolved.is_mocked
+    with pytest.raises(AllMockedAssertionError):
+        resolved.unwrap(request)
+
+    with pytest.raises(AllMockedAssertionError):
+        with router.resolver(request):
+            pass
+
+    assert route.call_count == 2
+    assert router.calls.call_count == 2
+    assert router.stats.misses == 2
+
+
 @pytest.mark.parametrize(
     ("url", "lookups", "expected"),
     [
@@ -229,6 +268,86 @@ def test_side_effect_with_route_kwarg():
     assert response.status_code == 501
 
 
+def test_response_template():
+    router = Router()
+    route = router.get("https://foo.bar/").respond(
+        201,
+        content=gzip.compress(b"foobar"),
+        headers={"Content-Encoding": "gzip"},
+        cookies={"ham": "spam"},
+    )
+    assert route._template is not None
+
+    request = httpx.Request("GET", "https://foo.bar/")
+    response = router.handler(request)
+    assert route.return_value is not None
+    expected = clone_response(route.return_value, request)
+    expected.read()
+
+    assert response is not route.return_value
+    assert response.request is request
+    assert response.status_code == expected.status_code == 201
+    assert response.headers == expected.headers
+    assert response.cookies == expected.cookies
+    assert response.content == expected.content == b"foobar"
+    assert response.num_bytes_downloaded == expected.num_bytes_downloaded
+    assert response.is_stream_consumed and expected.is_stream_consumed
+    assert response.is_closed and expected.is_closed
+
+    response.headers["X-Foo"] = "bar"
+    assert "X-Foo" not in router.handler(request).headers
+
+    # Changes to the return value apply to later responses
+    template = route._template
+    route.return_value.headers["X-Foo"] = "bar"
+    assert router.handler(request).headers["X-Foo"] == "bar"
+    assert route._template is not template
+    template = route._template
+    assert router.handler(request).headers["X-Foo"] == "bar"
+    assert route._template is template
+
+    route.return_value.status_code = 203
+    assert router.handler(request).status_code == 203
+    route.return_value.stream = httpx.ByteStream(gzip.compress(b"ham"))
+    assert router.handler(request).content == b"ham"
+    streamed = httpx.Response(200, content=iter([gzip.compress(b"egg")]))
+    route.return_value.stream = streamed.stream
+    response = router.handler(request)
+    assert getattr(route, "_template") is None  # noqa: B009
+    assert response.read() == b"egg"
+
+    route.return_value = httpx.Response(202, content=iter([b"foo", b"bar"]))
+    assert getattr(route, "_template") is None  # noqa: B009
+    response = router.handler(request)
+    assert response.status_code == 202
+    assert response.read() == b"foobar"
+
+
+def test_side_effect_invoker(monkeypatch):
+    router = Router()
+    getfullargspec = mock.Mock(wraps=inspect.getfullargspec)
+    monkeypatch.setattr(inspect, "getfullargspec", getfullargspec)
+
+    def foobar(request, route):
+        return httpx.Response(201, json={"calls": route.call_count})
+
+    route = router.get("https://foo.bar/").mock(side_effect=foobar)
+    route.snapshot()
+    side_effects = [foobar, lambda request: httpx.Response(202)]
+    route.side_effect = side_effects  # type: ignore[assignment]
+    assert getfullargspec.call_count == 1
+
+    request = httpx.Request("GET", "https://foo.bar/")
+    assert router.handler(request).json() == {"calls": 0}
+    assert router.handler(request).status_code == 202
+    assert getfullargspec.call_count == 3
+
+    route.rollback()
+    for calls in range(2):
+        assert router.handler(request).json() == {"calls": calls}
+    assert getfullargspec.call_count == 3
+
+
 def test_side_effect_with_reserved_route_kwarg():
     router = Router()
 
@@ -534,3 +653,398 @@ def test_routelist__unable_to_slice_assign():
     routes = RouteList()
     with pytest.raises(TypeError, match="slice assign"):
         routes[0:1] = routes
+
+
+def test_routelist__patterns():
+    routes = RouteList()
+    foo = routes.add(Route(host="foo.bar"), name="foo")
+    ham = routes.add(Route(host="ham.spam"), name="ham")
+
+    # Route with changed pattern is found by its new pattern
+    foo._set_pattern(M(host="egg.yolk"))
+    assert routes.add(Route(host="egg.yolk"), name="foo") is foo
+    assert routes.add(Route(host="foo.bar")) is not foo
+    assert len(routes) == 3
+
+    # Duplicate patterns, first route wins
+    ham._set_pattern(M(host="egg.yolk"))
+    assert routes.add(Route(host="egg.yolk"), name="foo") is foo
+    routes.pop("foo")
+    assert routes.add(Route(host="egg.yolk"), name="ham") is ham
+
+    # Copied routes are popped without patterns being looked up
+    copy = RouteList(routes)
+    assert copy.pop("ham") is ham
+    assert copy.add(Route(host="egg.yolk")) is not ham
+    assert routes.add(Route(host="egg.yolk")) is ham
+
+
+def test_routelist__candidates():
+    routes = RouteList()
+    foo = Route(method="GET", host="foo.bar", path="/baz/")
+    ham = Route(method="GET", host="ham.spam")
+    regex = Route(path__regex=r"/baz/$")
+    post = Route(method="POST")
+    catch_all = Route()
+    for route in (foo, ham, regex, post, catch_all):
+        routes.add(route)
+
+    # Routes are compiled when added
+    assert foo._matcher is not None
+    assert foo.compile() is foo._matcher
+
+    request = httpx.Request("GET", "https://foo.bar/baz/")
+    assert routes.candidates(RequestView(request)) == [foo, regex, catch_all]
+
+    request = httpx.Request("POST", "https://ham.spam/")
+    assert routes.candidates(RequestView(request)) == [post, catch_all]
+
+    # Index is rebuilt when routes change
+    routes.add(Route(method="POST", host="ham.spam"), name="ham_post")
+    ham_post = routes["ham_post"]
+    assert routes.candidates(RequestView(request)) == [post, catch_all, ham_post]
+    routes.pop("ham_post")
+    assert routes.candidates(RequestView(request)) == [post, catch_all]
+    routes.clear()
+    assert routes.candidates(RequestView(request)) == []
+
+
+@pytest.mark.parametrize(
+    "lookups",
+    [
+        {"path__in": ["/foo/", "/bar/"]},
+        {"host__in": ["foo.bar", "ham.spam"]},
+        {"port__in": [443, 8080]},
+        {"method__in": ["GET", "POST"], "scheme__in": ["https"]},
+    ],
+)
+def test_add__in_lookup_list(lookups):
+    router = Router()
+    route = router.route(**lookups).respond(201)
+    assert router.route(**lookups) is route
+    assert len(router.routes) == 1
+
+    request = httpx.Request("GET", "https://foo.bar/foo/")
+    assert router.resolve(request).route is route
+
+
+def test_routelist__params_candidates():
+    routes = RouteList()
+    foo = Route(path="/foo/", params__eq={"a": ["1", "2"], "b": "3"})
+    ham = Route(params__eq="a=1")
+    any_ = Route(path="/foo/", params__eq={"a": mock.ANY})
+    contains = Route(params={"b": "3"})
+    path = Route(path="/foo/")
+    for route in (foo, ham, any_, contains, path):
+        routes.add(route)
+
+    request = httpx.Request("GET", "https://foo.bar/foo/?b=3&a=1&a=2")
+    assert routes.candidates(RequestView(request)) == [foo, any_, contains, path]
+
+    request = httpx.Request("GET", "https://foo.bar/?a=1")
+    assert routes.candidates(RequestView(request)) == [ham, contains]
+
+    request = httpx.Request("GET", "https://foo.bar/foo/?a=2&a=1&b=3")
+    assert routes.candidates(RequestView(request)) == [any_, contains, path]
+
+
+def test_resolve__first_match_wins():
+    router = Router()
+    catch_all = router.route().respond(418)
+    exact = router.get("https://foo.bar/baz/").respond(201)
+    regex = router.get(url__regex=r"/baz/").respond(202)
+
+    request = httpx.Request("GET", "https://foo.bar/baz/")
+    assert router.resolve(request).route is catch_all
+
+    router.routes[:] = RouteList()
+    router.add(exact)
+    router.add(regex)
+    router.add(catch_all)
+    assert router.resolve(request).route is exact
+
+    request = httpx.Request("GET", "https://ham.spam/baz/")
+    assert router.resolve(request).route is regex
+
+
+@pytest.mark.parametrize(
+    ("keep_calls", "kept"),
+    [
+        (None, [200, 201, 202, 203, 204]),
+        (3, [200, 201, 202, 203, 204]),
+        (2, [203, 204]),
+        (0, []),
+    ],
+)
+def test_keep_calls(keep_calls, kept):
+    router = Router(keep_calls=keep_calls)
+    route = router.get("https://foo.bar/")
+    route.side_effect = [httpx.Response(status) for status in range(200, 205)]
+
+    router.snapshot()
+    for _ in range(5):
+        router.handler(httpx.Request("GET", "https://foo.bar/"))
+
+    for calls in (router.calls, route.calls):
+        assert calls.called
+        assert calls.call_count == 5
+        calls.assert_called()
+        assert [call.response.status_code for call in calls] == kept
+        assert calls.last.response.status_code == 204
+    router.assert_all_called()
+
+    router.rollback()
+    assert not route.called
+    assert route.call_count == 0
+    assert router.calls.call_count == 0
+
+    router.handler(httpx.Request("GET", "https://foo.bar/"))
+    route.reset()
+    assert not route.called
+    with pytest.raises(IndexError):
+        route.calls.last
+
+
+def test_keep_calls__negative():
+    with pytest.raises(ValueError, match="Keep calls must not be negative"):
+        Router(keep_calls=-1)
+    with pytest.raises(ValueError, match="Keep calls must not be negative"):
+        MockRouter(keep_calls=-1)
+
+
+def test_rollback__changed_routes_only():
+    router = Router(assert_all_called=False)
+    foo = router.get("https://foo.bar/", name="foo") % 201
+    ham = router.get("https://ham.spam/", name="ham")
+    ham.side_effect = itertools.cycle([httpx.Response(202), httpx.Response(203)])
+    egg = router.get("https://egg.yolk/")
+    foo_snapshots, ham_snapshots = list(foo._snapshots), list(ham._snapshots)
+
+    # Routes are shared with snapshot, and route states are not yet snapshotted
+    routes = router.routes._routes
+    router.snapshot()
+    assert router.routes._routes is routes
+    assert foo._snapshots == foo_snapshots
+    assert ham._snapshots == ham_snapshots
+
+    assert router.handler(httpx.Request("GET", "https://ham.spam/")).status_code == 202
+    router.pop("foo").respond(404)
+    spam = router.get("https://spam.egg/")
+    router.handler(httpx.Request("GET", "https://spam.egg/"))
+    assert router.routes._routes is not routes
+    assert len(foo._snapshots) == len(foo_snapshots) + 1
+    assert len(egg._snapshots) == 1
+
+    router.rollback()
+    assert router.routes._routes is routes
+    assert list(router.routes) == [foo, ham, egg]
+    assert foo.return_value is not None
+    assert foo.return_value.status_code == 201
+    assert not ham.called
+    assert router.handler(httpx.Request("GET", "https://ham.spam/")).status_code == 202
+    assert router.handler(httpx.Request("GET", "https://ham.spam/")).status_code == 203
+
+    # Routes added since snapshot keep their state
+    assert spam.called
+
+    # Routes with duplicate patterns are looked up one by one
+    egg._set_pattern(foo.pattern)
+    router.snapshot()
+    egg.respond(418)
+    router.rollback()
+    assert egg.return_value is None
+    egg._set_pattern(M(host="egg.yolk"))
+    request = httpx.Request("GET", "https://egg.yolk/")
+    assert router.routes.candidates(RequestView(request)) == [egg]
+
+    # Nothing to roll back without snapshot
+    route_list = RouteList()
+    route_list.rollback()
+    assert not route_list
+
+
+def test_rollback__calls():
+    router = Router(keep_calls=1)
+    router.get("https://foo.bar/") % 204
+    request = httpx.Request("GET", "https://foo.bar/")
+    router.handler(request)
+
+    # Calls are not copied unless about to be dropped, or cleared
+    router.snapshot()
+    snapshot = router._snapshots[-1]
+    router.handler(request)
+    assert snapshot.calls is None
+    router.handler(request)
+    assert len(getattr(snapshot, "calls")) == 1  # noqa: B009
+    router.snapshot()
+    router.snapshot()
+    router.reset()
+    router.rollback()
+    router.rollback()
+    assert router.calls.call_count == 3
+    assert len(router.calls) == 1
+
+    router.rollback()
+    assert router.calls.call_count == 1
+    assert len(router.calls) == 1
+    assert router.calls.last.request is request
+
+    # Snapshots taken since forgotten snapshot are forgotten too
+    router.snapshot()
+    router.calls._snapshot()
+    router.rollback()
+    assert not router.calls._snapshots
+
+
+def test_resolve__rollback_route_pattern():
+    router = Router()
+    route = router.get("https://foo.bar/baz/", name="baz")
+    route.snapshot()
+    router.get("https://foo.bar/ham/", name="baz")
+
+    request = httpx.Request("GET", "https://foo.bar/ham/")
+    assert router.resolve(request).route is route
+
+    # Rolled back route pattern invalidates router index
+    route.rollback()
+    request = httpx.Request("GET", "https://foo.bar/baz/")
+    assert router.resolve(request).route is route
+
+
+def test_routelist__regex_candidates(monkeypatch):
+    monkeypatch.setattr(RegexIndex, "chunk_size", 2)
+    routes = RouteList()
+    wildcard = Route(url="all://*.foo.bar")
+    slug = Route(path__regex=r"/(?P<slug>\w+)/$")
+    api = Route(url__regex=r"^https://foo.bar/api/")
+    backref = Route(path__regex=r"/(\w+)/\1/")
+    ignorecase = Route(host__regex=re.compile(r"FOO", re.IGNORECASE))
+    alternation = Route(path__regex=r"^/ham/|/egg/")
+    exact = Route(method="GET", host="foo.bar")
+    ham = Route(method="GET", path__regex=r"/(?P<slug>\w+)/$")
+    for route in (wildcard, slug, api, backref, ignorecase, alternation, exact, ham):
+        routes.add(route)
+
+    request = httpx.Request("GET", "https://foo.bar/api/ham/")
+    candidates = [slug, api, backref, ignorecase, exact, ham]
+    assert routes.candidates(RequestView(request)) == candidates
+
+    # Method is checked by route, when more selective regex is indexed
+    request = httpx.Request("POST", "https://baz.foo.bar/spam/egg/")
+    candidates = [wildcard, slug, backref, ignorecase, alternation, ham]
+    assert routes.candidates(RequestView(request)) == candidates
+
+
+def test_routelist__prefix_candidates():
+    routes = RouteList()
+    api = Route(path__startswith="/api/")
+    users = Route(method="GET", path__startswith="/api/users/")
+    user = Route(path__startswith="/api/user")
+    apps = Route(path__startswith="/apps/")
+    root = Route(path__startswith="/")
+    host = Route(host="foo.bar", path__startswith="/")
+    for route in (api, users, user, apps, root, host):
+        routes.add(route)
+
+    request = httpx.Request("GET", "https://foo.bar/api/users/123/")
+    candidates = [api, users, user, root, host]
+    assert routes.candidates(RequestView(request)) == candidates
+
+    request = httpx.Request("GET", "https://ham.spam/api/user")
+    assert routes.candidates(RequestView(request)) == [api, user, root]
+
+    request = httpx.Request("GET", "https://ham.spam/app/")
+    assert routes.candidates(RequestView(request)) == [root]
+
+
+@pytest.mark.parametrize(
+    ("path", "url", "expected"),
+    [
+        ("/baz/", "https://foo.bar/api/baz/", "exact,prefix,regex,in"),
+        ("/baz/", "https://foo.bar/api/baz/egg/", "prefix,regex"),
+        ("/baz/", "https://foo.bar/api//baz/", "exact,prefix,regex,in"),
+        ("/baz/", "https://foo.bar/api///ham/", "regex,in"),
+        ("/baz/", "https://foo.bar/apibaz/", ""),
+        ("/baz/", "https://foo.bar/baz/", ""),
+        ("/", "https://foo.bar/api/", "exact,prefix,regex,in"),
+        ("/", "https://foo.bar/api/baz/", "prefix,regex"),
+        ("/", "https://foo.bar/api", ""),
+    ],
+)
+def test_resolve__base_url_path(path, url, expected):
+    router = Router(base_url="https://foo.bar/api/")
+    routes = {
+        "exact": router.get(path),
+        "prefix": router.route(path__startswith=path),
+        "regex": router.route(path__regex=r".*"),
+        "in": router.route(method__in=("GET", "POST"), path__in=(path, "//ham/")),
+    }
+
+    request = httpx.Request("GET", url)
+    matches = [name for name, route in routes.items() if route.match(request)]
+    assert ",".join(matches) == expected
+
+    # Candidates never miss a matching route
+    candidates = router.routes.candidates(RequestView(request))
+    assert all(routes[name] in candidates for name in matches)
+
+
+def test_resolve__base_url_compiled_route():
+    route = Route(method="GET", path="/foo/") % 201
+    assert route.match(httpx.Request("GET", "https://foo.bar/foo/"))
+
+    # Route compiled before added, i.e. merged with base in place
+    router = Router(base_url="/api", assert_all_mocked=False)
+    router.add(route)
+    assert router.resolve(httpx.Request("GET", "https://foo.bar/api/foo/")).route
+    assert not router.resolve(httpx.Request("GET", "https://foo.bar/foo/")).route
+
+
+@pytest.mark.parametrize(
+    ("prefixes", "path", "expected"),
+    [
+        (["/api/", "/apps/", "/a"], "/apps/1/", [1, 2]),
+        (["/a", "/apps/", "/api/"], "/api/1/", [0, 2]),
+        (["/api/users/", "/api/"], "/api/users", [1]),
+        (["/api/", "/api/"], "/api/", [0, 1]),
+        (["", "/api/"], "/", [0]),
+        (["/api/"], "/", []),
+    ],
+)
+def test_prefix_index(prefixes, path, expected):
+    index = PrefixIndex()
+    assert not index
+    for position, prefix in enumerate(prefixes):
+        index.add(prefix, position)
+    assert index
+    assert sorted(index.search(path)) == expected
+
+
+@pytest.mark.parametrize(
+    ("regex", "expected"),
+    [
+        (r"^/(?P<slug>\w+)/$", r"^/(?:\w+)/$"),
+        (r"/(?P<slug>\w+)/(\d+)/", r"/(?:\w+)/(\d+)/"),
+        (r"/\(?P<slug>\w+\)/", r"/\(?P<slug>\w+\)/"),
+        (r"/(\w+)/\1/", None),
+        (r"/(?P<slug>\w+)/(?P=slug)/", None),
+        (r"/(?P<slug>\w+)?(?(slug)/|$)", None),
+        (r"/[(?P<slug>]/", None),
+        (r"\\(?P<slug>\w+)/", None),
+        (r"(?i)/baz/", None),
+        (re.compile(rb"/baz/"), None),
+    ],
+)
+def test_get_regex_source(regex, expected):
+    assert get_regex_source(re.compile(regex)) == expected
+
+
+def test_resolve__regex_context():
+    router = Router()
+    router.get(url__regex=r"^https://foo.bar/api/", path="/api/egg/")
+    route = router.get(path__regex=r"^/api/(?P<slug>\w+)/$")
+    route.side_effect = lambda request, slug: httpx.Response(200, text=slug)
+
+    request = httpx.Request("GET", "https://foo.bar/api/ham/")
+    response = router.handler(request)
+    assert response.text == "ham"
@@ -4,7 +4,9 @@ import httpx
 import pytest
 
 import respx
+from respx.models import AllMockedAssertionError
 from respx.router import MockRouter
+from respx.stats import Histogram, Stats
 
 
 async def test_named_route():
@@ -103,3 +105,91 @@ def test_trio():  # pragma: nocover
     import trio
 
     trio.run(backend_test)
+
+
+@pytest.mark.parametrize(
+    ("value", "highest"),
+    [
+        (0, 0),
+        (31, 31),
+        (32, 33),
+        (63, 63),
+        (64, 67),
+        (1_000_000, 1_015_807),
+    ],
+)
+def test_histogram_buckets(value, highest):
+    histogram = Histogram()
+    index = histogram._index(value)
+    assert histogram._highest_value(index) == highest
+    assert histogram._index(highest) == index
+    assert histogram._index(highest + 1) == index + 1
+
+
+def test_histogram():
+    histogram = Histogram()
+    assert histogram.mean == 0.0
+    assert histogram.percentile(50) == 0.0
+
+    for micros in range(1, 1001):
+        histogram.record(micros / 1_000_000)
+
+    assert histogram.count == 1000
+    assert histogram.min == 0.000001
+    assert histogram.max == 0.001
+    assert histogram.mean == pytest.approx(0.0005005)
+    assert histogram.percentile(0) == 0.000001
+    assert histogram.percentile(50) == pytest.approx(0.000500, rel=1 / 16)
+    assert histogram.percentile(99) == pytest.approx(0.000990, rel=1 / 16)
+    assert histogram.percentile(100) == 0.001
+
+    histogram.reset()
+    assert histogram.count == 0
+    assert histogram.max is None
+
+
+def test_stats():
+    stats = Stats()
+    stats.record(httpx.Response(200), elapsed=0.1)
+    stats.record(httpx.Response(200))
+    stats.record(None, error=True, elapsed=0.2)
+    stats.record(httpx.Response(404), matched=False, elapsed=0.3)
+
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert stats.errors == 1
+    assert stats.status_codes == {200: 2, 404: 1}
+    assert stats.latency.count == 3
+
+    stats.reset()
+    assert stats.hits == 0
+    assert stats.status_codes == {}
+    assert stats.latency.count == 0
+
+
+def test_router_stats():
+    with MockRouter(assert_all_called=False) as respx_mock:
+        route = respx_mock.get("https://foo.bar/", name="foo")
+        route.side_effect = [httpx.Response(201), httpx.Response(404), ValueError]
+
+        httpx.get("https://foo.bar/")
+        httpx.get("https://foo.bar/")
+        with pytest.raises(ValueError):
+            httpx.get("https://foo.bar/")
+        with pytest.raises(AllMockedAssertionError):
+            httpx.get("https://egg.yolk/")
+
+        assert route.stats.hits == 3
+        assert route.stats.errors == 1
+        assert route.stats.status_codes == {201: 1, 404: 1}
+        assert route.stats.latency.count == 3
+
+        stats = respx_mock.stats
+        assert stats.hits == 3
+        assert stats.misses == 1
+        assert stats.errors == 1
+        assert stats.latency.count == 4
+
+        respx_mock.reset()
+        assert route.stats.hits == 0
+        assert stats.hits == 0
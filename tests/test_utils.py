@@ -1,6 +1,18 @@
+from collections import Counter
 from datetime import datetime, timezone
+from random import Random
 
-from respx.utils import SetCookie
+import httpx
+import pytest
+
+from respx.utils import (
+    AliasTable,
+    FileStream,
+    MultiItems,
+    RequestView,
+    SetCookie,
+    parse_range,
+)
 
 
 class TestSetCookie:
@@ -31,3 +43,115 @@ class TestSetCookie:
                 "Partitioned"
             ),
         )
+
+
+class TestMultiItems:
+    def test_multi_items(self) -> None:
+        items = MultiItems([("foo", ["bar", "baz"]), ("ham", "spam")])
+        items.append("ham", "egg")
+        assert items.get_list("ham") == ["spam", "egg"]
+        assert items.multi_items() == [
+            ("foo", "bar"),
+            ("foo", "baz"),
+            ("ham", "spam"),
+            ("ham", "egg"),
+        ]
+
+
+class TestRequestView:
+    def test_parses_request_values_once(self) -> None:
+        request = httpx.Request(
+            "POST",
+            "https://foo.bar:8080?ham=spam",
+            cookies={"egg": "yolk"},
+            data={"foo": "bar"},
+        )
+        view = RequestView(request)
+        assert RequestView.of(view) is view
+        assert RequestView.of(request) is not view
+        assert view.request is request
+
+        assert view.method == "POST"
+        assert view.scheme == "https"
+        assert view.host == "foo.bar"
+        assert view.port == 8080
+        assert view.path == "/"
+        assert view.url_string == "https://foo.bar:8080/?ham=spam"
+        assert view.params == httpx.QueryParams({"ham": "spam"})
+        assert view.cookies == {("egg", "yolk")}
+        assert view.content == b"foo=bar"
+        assert view.data == MultiItems([("foo", "bar")])
+        assert view.files == MultiItems()
+        assert view.params is view.params
+        assert view.form is view.form
+
+        # Unknown attributes are looked up on the wrapped request
+        assert view.extensions is request.extensions
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("bytes=0-3", (0, 4)),
+        ("bytes=2-", (2, 10)),
+        ("bytes=-3", (7, 10)),
+        ("bytes=-30", (0, 10)),
+        ("bytes=5-50", (5, 10)),
+        ("Bytes = 9-9", (9, 10)),
+        ("bytes=3-2", None),
+        ("bytes=0-1,5-6", None),
+        ("bytes=-", None),
+        ("bytes=a-b", None),
+        ("bytes=0", None),
+        ("items=0-3", None),
+        ("bytes=10-", ValueError),
+        ("bytes=-0", ValueError),
+    ],
+)
+def test_parse_range(value, expected):
+    if expected is ValueError:
+        with pytest.raises(ValueError, match="Unsatisfiable range"):
+            parse_range(value, 10)
+    else:
+        assert parse_range(value, 10) == expected
+
+
+def test_file_stream(tmp_path):
+    path = tmp_path / "foobar.bin"
+    path.write_bytes(b"0123456789")
+
+    stream = FileStream(path)
+    assert stream.size == 10
+    assert b"".join(stream) == b"0123456789"
+
+    stream = stream[2:-2]
+    assert stream.size == 6
+    assert b"".join(stream) == b"234567"
+    assert b"".join(stream[1:3]) == b"34"
+    assert b"".join(stream[4:]) == b"67"
+    assert stream[6:].size == 0
+    assert b"".join(stream[6:]) == b""
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        [1],
+        [97, 2, 1],
+        [0.5, 0.25, 0.25],
+        [1, 0, 3, 6],
+    ],
+)
+def test_alias_table(weights):
+    table = AliasTable(weights)
+    random = Random(0)
+    counts = Counter(table.sample(random) for _ in range(20_000))
+    for index, weight in enumerate(weights):
+        expected = weight / sum(weights)
+        assert counts[index] / 20_000 == pytest.approx(expected, abs=0.01)
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0], [1, -1]])
+def test_alias_table__invalid_weights(weights):
+    with pytest.raises(ValueError, match="Weights must be positive"):
+        AliasTable(weights)